@@ -0,0 +1,111 @@
+"""
+시작 시간 벤치마크: 모듈별 import 비용 + 딸려 오는 무거운 라이브러리
+
+모듈마다 새 파이썬 프로세스에서 불러와 import 에 걸린 시간(하위 import 포함)을 잽니다.
+app.py 가 맨 위에서 불러오는 모듈이 FDR/cloudscraper/bs4/yfinance 같은 무거운 라이브러리를
+끌고 오면 '무거운 의존성' 열에 표시됩니다.
+
+사용법:
+    python benchmarks/bench_imports.py
+    python benchmarks/bench_imports.py --repeat 5 --max-ms 300
+
+--max-ms 를 주면 앱 모듈을 한 프로세스에서 모두 불러온 시간이 그보다 클 때 종료 코드 1로 끝납니다 (회귀 확인용).
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# app.py 가 시작할 때 불러오는 이 저장소의 모듈
+APP_MODULES = [
+    "price_store", "price_parser", "market_data", "bond_yield", "disk_cache",
+    "sparkline", "downsample", "market_snapshot", "derived_series", "source_replay",
+    "run_metrics", "market_cards",
+]
+# 참고용 외부 라이브러리
+THIRD_PARTY_MODULES = [
+    "streamlit", "pandas", "plotly.graph_objects", "yfinance", "requests",
+    "cloudscraper", "FinanceDataReader", "bs4",
+]
+# 필요한 경로에서만 불러와야 하는 라이브러리
+HEAVY_MODULES = ["plotly", "yfinance", "requests", "cloudscraper", "FinanceDataReader", "bs4"]
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {modules}
+elapsed = time.perf_counter() - start
+print(elapsed * 1000)
+print(','.join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def measure(modules):
+    """
+    모듈들을 새 프로세스에서 한 번에 불러와
+    (import 시간 ms, 같이 불러와진 무거운 라이브러리 목록) 반환 (불러올 수 없으면 None)
+    """
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(modules=", ".join(modules), heavy=HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return None
+    elapsed, heavy = (proc.stdout.splitlines() + [""])[:2]
+    own = {m.split(".")[0] for m in modules}
+    loaded = [m for m in heavy.split(",") if m and m not in own]
+    return float(elapsed), loaded
+
+
+def best_of(modules, repeat):
+    """가장 빠른 회차 기준"""
+    best = None
+    for _ in range(repeat):
+        result = measure(modules)
+        if result is None:
+            return None
+        if best is None or result[0] < best[0]:
+            best = result
+    return best
+
+
+def report(label, result, show_heavy):
+    if result is None:
+        print(f"  {label:<22} {'(불러올 수 없음)':>12}")
+        return
+    ms, loaded = result
+    heavy = f"  무거운 의존성: {', '.join(loaded)}" if loaded and show_heavy else ""
+    print(f"  {label:<22} {ms:>9.1f} ms{heavy}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모듈별 import 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-ms", type=float, default=None, help="앱 시작 경로 import 시간 허용치 (ms)")
+    parser.add_argument("--skip-third-party", action="store_true", help="외부 라이브러리 측정 생략")
+    args = parser.parse_args()
+
+    print("[앱 모듈 (각각 새 프로세스)]")
+    for module in APP_MODULES:
+        report(module, best_of([module], args.repeat), show_heavy=True)
+
+    # app.py 시작 경로와 같이 한 프로세스에서 모두 불러온 비용 (공유 의존성은 한 번만)
+    combined = best_of(APP_MODULES, args.repeat)
+    print("[앱 시작 경로 (한 프로세스)]")
+    report("합계", combined, show_heavy=True)
+
+    if not args.skip_third_party:
+        print("[외부 라이브러리]")
+        for module in THIRD_PARTY_MODULES:
+            report(module, best_of([module], args.repeat), show_heavy=False)
+
+    app_total = combined[0] if combined is not None else float("inf")
+    if args.max_ms is not None and app_total > args.max_ms:
+        print(f"❌ import 시간 {app_total:.1f} ms > 기준 {args.max_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+가격 파서 처리량 벤치마크 (lines/sec) + 섹션 추출 시간
+
+사용법:
+    python benchmarks/bench_parser.py
+    python benchmarks/bench_parser.py --lines 100000 --min-lps 50000
+
+--min-lps 를 주면 처리량이 그보다 낮을 때 종료 코드 1로 끝납니다 (회귀 확인용).
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from price_parser import parse_price_data, extract_sections  # noqa: E402
+from synthetic import make_cafe_post  # noqa: E402
+
+
+def bench_parse(num_lines, repeat):
+    """가장 빠른 회차 기준 lines/sec"""
+    post = make_cafe_post(num_lines)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_price_data(post)
+        best = min(best, time.perf_counter() - start)
+    return num_lines / best
+
+
+def bench_extract(num_lines, repeat):
+    """RAM/SSD/CPU/GPU 섹션 동시 추출 (가장 빠른 회차, ms)"""
+    post = make_cafe_post(num_lines)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract_sections(post)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가격 파서 처리량 벤치마크")
+    parser.add_argument("--lines", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-lps", type=float, default=None, help="최소 허용 lines/sec")
+    args = parser.parse_args()
+
+    worst = None
+    for num_lines in args.lines:
+        lps = bench_parse(num_lines, args.repeat)
+        worst = lps if worst is None else min(worst, lps)
+        print(f"parse_price_data  {num_lines:>7} lines  {lps:>12,.0f} lines/sec")
+        print(f"extract_sections  {num_lines:>7} lines  {bench_extract(num_lines, args.repeat):>12.2f} ms")
+
+    if args.min_lps is not None and worst < args.min_lps:
+        print(f"❌ 처리량 {worst:,.0f} < 기준 {args.min_lps:,.0f} lines/sec")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
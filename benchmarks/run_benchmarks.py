@@ -0,0 +1,265 @@
+"""
+대시보드 전체 벤치마크 (파싱, 히스토리 조회/저장, 카드 렌더링)
+
+합성 데이터로 주요 경로의 시간을 재고 결과를 JSON 파일로 남깁니다.
+같은 옵션으로 돌린 두 결과 파일을 --compare 로 비교할 수 있습니다.
+
+    python benchmarks/run_benchmarks.py                       # 기본 크기
+    python benchmarks/run_benchmarks.py --quick               # 빠른 확인용 (작은 크기)
+    python benchmarks/run_benchmarks.py --years 1 5 10 --products 300
+    python benchmarks/run_benchmarks.py --out after.json --compare before.json
+
+측정 항목 (app.py 에서 대응하는 함수)
+- parse_price_data / extract_ram_section : 1천 ~ 10만 줄 게시글
+- history.populate      : 히스토리 일괄 저장 (백업 복원 = replace_history)
+- history.load          : 전체 중첩 dict 재구성 (예전 load_price_history, 비교용)
+- history.table_build   : load_price_history (열 단위 PriceHistoryTable 최초 생성)
+- history.memory        : 중첩 dict / 열 단위 표가 차지하는 메모리 (tracemalloc)
+- history.trend         : get_price_trend (최근 30일 / 전체)
+- history.save_snapshot : save_price_history (큰 히스토리에 스냅샷 1개 추가 + 인덱스 갱신)
+- cards.snapshot        : get_market_snapshot (종가 표 + 합성 지표 + 요약 표)
+- cards.render          : 카드 전체 HTML (market_cards.card_row_html, 스파크라인 캐시 없음 / 캐시 적중)
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from price_parser import parse_price_data, extract_ram_section  # noqa: E402
+from price_store import PriceHistoryStore  # noqa: E402
+from synthetic import make_cafe_post, SyntheticHistory, HISTORY_SLOTS, make_yahoo_frame  # noqa: E402
+
+# 카드 탭에 표시되는 티커 + 합성 지표 입력 (app.py 의 tickers 와 같은 구성)
+CARD_TICKERS = [
+    "^KS11", "^DJI", "^GSPC", "^IXIC", "CL=F", "GC=F", "^VIX", "HG=F",
+    "KRW=X", "CNY=X", "JPYKRW=X", "DX-Y.NYB", "ZT=F", "^TNX",
+]
+CARD_NAMES = [t for t in CARD_TICKERS if t not in ("CNY=X", "JPYKRW=X")] + ["CALC_CNYKRW", "JPYKRW_100"]
+
+
+# ==========================================
+# 측정 도구
+# ==========================================
+def measure(fn, repeat, setup=None):
+    """fn() 을 repeat 번 실행 -> (최소, 중앙값) 초. setup 이 있으면 매 회차 전에 호출 (시간 제외)"""
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        fn(arg) if setup is not None else fn()
+        times.append(time.perf_counter() - start)
+    return min(times), statistics.median(times)
+
+
+class Results:
+    def __init__(self):
+        self.rows = []
+
+    def add(self, name, params, timing, repeat, **extra):
+        best, median = timing
+        row = {"name": name, "params": params, "best_ms": best * 1000, "median_ms": median * 1000,
+               "repeat": repeat}
+        row.update(extra)
+        self.rows.append(row)
+        label = ", ".join(f"{k}={v}" for k, v in params.items())
+        more = "".join(f"  {k}={v:,.0f}" for k, v in extra.items())
+        print(f"{name:<24} {label:<34} best {best * 1000:>10.2f} ms  median {median * 1000:>10.2f} ms{more}")
+
+
+# ==========================================
+# 벤치마크
+# ==========================================
+def bench_parser(results, line_counts, repeat):
+    for num_lines in line_counts:
+        post = make_cafe_post(num_lines)
+        timing = measure(lambda: parse_price_data(post), repeat)
+        results.add("parse_price_data", {"lines": num_lines}, timing, repeat,
+                    lines_per_sec=num_lines / timing[0])
+        timing = measure(lambda: extract_ram_section(post), repeat)
+        results.add("extract_ram_section", {"lines": num_lines}, timing, repeat)
+
+
+def bench_history(results, years_list, num_products, repeat, workdir):
+    for years in years_list:
+        params = {"years": years, "products": num_products}
+        db_path = os.path.join(workdir, f"history_{years}y.db")
+        history = SyntheticHistory(years, num_products)
+        store = PriceHistoryStore(db_path, legacy_json_path=os.path.join(workdir, "none.json"))
+
+        # 일괄 저장은 한 번만 (큰 크기에서는 오래 걸림)
+        timing = measure(lambda: store.replace_history(history), 1)
+        results.add("history.populate", params, timing, 1, rows=history.rows())
+
+        timing = measure(store.load_history, repeat)
+        results.add("history.load", params, timing, repeat)
+
+        def fresh_store(_=None):
+            return PriceHistoryStore(db_path, legacy_json_path=os.path.join(workdir, "none.json"))
+        timing = measure(lambda s: s.history_table(), repeat, setup=fresh_store)
+        results.add("history.table_build", params, timing, repeat)
+
+        tracemalloc.start()
+        nested = store.load_history()
+        dict_bytes = tracemalloc.get_traced_memory()[0]
+        del nested
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        table = fresh_store().history_table()
+        table_bytes = tracemalloc.get_traced_memory()[0] - base
+        tracemalloc.stop()
+        del table
+        results.add("history.memory", params, (0.0, 0.0), 1,
+                    dict_kb=dict_bytes / 1024, table_kb=table_bytes / 1024)
+
+        index = store.history_table()
+        rng = random.Random(1)
+        products = [name for _, name, _ in history.catalog]
+        for days in (30, 365 * 10):
+            cutoff = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+            picks = [rng.choice(products) for _ in range(50)]
+            timing = measure(lambda: [index.trend(p, cutoff) for p in picks], repeat)
+            results.add("history.trend", dict(params, days=days, queries=len(picks)), timing, repeat)
+
+        # 기존 기록 다음 날짜에 스냅샷 추가 (회차마다 다른 날짜라 덮어쓰기가 아닌 추가)
+        snap_rng = random.Random(2)
+        prices = [base for _, _, base in history.catalog]
+        future = [(history.end_date + timedelta(days=k + 1)).strftime('%Y-%m-%d') for k in range(repeat)]
+
+        def save_one():
+            date_key = future.pop()
+            store.save_snapshot(date_key, HISTORY_SLOTS[0], history.snapshot(snap_rng, prices))
+            store.history_table()
+        timing = measure(save_one, repeat)
+        results.add("history.save_snapshot", params, timing, repeat)
+
+
+def bench_cards(results, repeat):
+    from derived_series import compute_derived
+    from market_cards import card_row_html
+    from market_snapshot import close_prices, compute_snapshot
+    from sparkline import SparklineCache
+
+    for interval, rows in (("30m", 5 * 14), ("1d", 252)):
+        params = {"interval": interval, "rows": rows, "tickers": len(CARD_TICKERS)}
+        frame = make_yahoo_frame(CARD_TICKERS, rows, interval)
+
+        def build_view():
+            closes = compute_derived(close_prices(frame))
+            return closes, compute_snapshot(closes)
+        timing = measure(build_view, repeat)
+        results.add("cards.snapshot", params, timing, repeat)
+
+        view = build_view()
+        cards = [(ticker, ticker) for ticker in CARD_NAMES]
+
+        def render(cache):
+            # 앱이 카드 줄마다 쓰는 market_cards 그대로 (국채 카드 제외)
+            return card_row_html(view, cards, interval, sparklines=cache)
+
+        timing = measure(render, repeat, setup=lambda: SparklineCache())
+        results.add("cards.render", dict(params, cache="cold"), timing, repeat)
+        warm = SparklineCache()
+        render(warm)
+        timing = measure(lambda: render(warm), repeat)
+        results.add("cards.render", dict(params, cache="warm"), timing, repeat)
+
+
+# ==========================================
+# 결과 파일
+# ==========================================
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _result_key(row):
+    return row["name"], json.dumps(row["params"], sort_keys=True)
+
+
+def compare(rows, baseline_path, threshold):
+    """기준 결과와 best_ms 비교 (threshold 배 이상 느려진 항목 수 반환)"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {_result_key(row): row for row in json.load(f)["results"]}
+    slower = 0
+    print(f"\n[기준 {baseline_path} 대비]")
+    for row in rows:
+        old = baseline.get(_result_key(row))
+        if old is None or not old["best_ms"]:
+            continue
+        ratio = row["best_ms"] / old["best_ms"]
+        mark = ""
+        if ratio >= threshold:
+            mark, slower = "  ❌ 느려짐", slower + 1
+        elif ratio <= 1 / threshold:
+            mark = "  ✅ 빨라짐"
+        label = ", ".join(f"{k}={v}" for k, v in row["params"].items())
+        print(f"{row['name']:<24} {label:<34} {old['best_ms']:>10.2f} → {row['best_ms']:>10.2f} ms  x{ratio:.2f}{mark}")
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 벤치마크")
+    parser.add_argument("--quick", action="store_true", help="작은 크기로 빠르게")
+    parser.add_argument("--lines", type=int, nargs="+", default=None)
+    parser.add_argument("--years", type=float, nargs="+", default=None)
+    parser.add_argument("--products", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=["parser", "history", "cards"], default=None)
+    parser.add_argument("--out", default=os.path.join(ROOT, "benchmarks", "results.json"))
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=1.2, help="이 배수 이상 느려지면 실패 (--compare)")
+    args = parser.parse_args()
+
+    lines = args.lines or ([1000, 10000] if args.quick else [1000, 10000, 100000])
+    years = args.years or ([0.25] if args.quick else [1, 3])
+    products = args.products or (50 if args.quick else 200)
+    only = set(args.only or ["parser", "history", "cards"])
+
+    results = Results()
+    workdir = tempfile.mkdtemp(prefix="bench_history_")
+    try:
+        if "parser" in only:
+            bench_parser(results, lines, args.repeat)
+        if "history" in only:
+            bench_history(results, years, products, args.repeat, workdir)
+        if "cards" in only:
+            bench_cards(results, args.repeat)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {"lines": lines, "years": years, "products": products, "repeat": args.repeat},
+        },
+        "results": results.rows,
+    }
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {args.out}")
+
+    if args.compare and compare(results.rows, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+벤치마크용 합성 데이터 생성기
+
+실제 네이버 카페 시세 게시글과 비슷한 형식의 줄을 무작위로 섞어 만듭니다.
+"""
+import random
+
+_POST_HEADER = [
+    "안녕하세요 오늘의 매입 시세입니다.",
+    "(시세는 매일 변동될 수 있습니다)",
+    "* 택배 매입은 도착일 기준 시세 적용",
+    "",
+]
+
+_CPU_LINES = [
+    "8-{n}.i{g} {m}00K - {p}원",
+    "8-{n}.i{g} {m}00KF - {p}원",
+    "9-{n}.R{g} {m}600X - {p}원",
+]
+
+_RAM_SECTIONS = [
+    ("13.데스크탑 DDR3", ["13-{n}.삼성 {c}G PC3 12800 - {p}원"]),
+    ("14.데스크탑 DDR4", ["14-{n}.삼성 {c}G PC4 25600 [3200mhz] - {p}원 , 21300[2666mhz] - {p}원",
+                         "14-{n}.삼성 {c}G PC4 19200[2400mhz] - {p}원"]),
+    ("15.노트북용 DDR3", ["15-{n}.삼성 {c}G PC3 12800 - {p}원"]),
+    ("16.노트북용 DDR4", ["16-{n}.삼성 {c}G PC4 25600 [3200mhz] - {p}원"]),
+    ("16-1.데스크탑용 DDR5", ["16-1-{n}.삼성 D5 {c}G- 5600 [44800] - {p}원 , 4800 - {p}원"]),
+]
+
+_OTHER_LINES = [
+    "RTX {m}060 - {p}원",
+    "GTX {m}660 - {p}원",
+    "B{m}60 칩셋 {p}원",
+    "17.SSD 삼성 {c}0G,{c}2G - {p}원",
+    "{t}테라,{t}TB - {p}원",
+    "* 불량품은 매입 불가",
+    "(박스 미포함 시 감가)",
+]
+
+def _price(rng):
+    value = rng.randint(1, 500) * 1000
+    return f"{value:,}".replace(',', rng.choice([',', '.']))
+
+def _fill(template, rng):
+    return template.format(
+        n=rng.randint(1, 30), g=rng.choice([3, 5, 7, 9]), m=rng.randint(1, 9),
+        c=rng.choice([4, 8, 16, 32]), t=rng.randint(1, 8), p=_price(rng)
+    )
+
+def make_cafe_post(num_lines, seed=0):
+    """num_lines 줄 분량의 합성 카페 게시글 (RAM 섹션 포함)"""
+    rng = random.Random(seed)
+    lines = list(_POST_HEADER)
+    lines.append("8.CPU 시세")
+    while len(lines) < num_lines:
+        roll = rng.random()
+        if roll < 0.2:
+            lines.append(_fill(rng.choice(_CPU_LINES), rng))
+        elif roll < 0.4:
+            lines.append(_fill(rng.choice(_OTHER_LINES), rng))
+        else:
+            header, templates = rng.choice(_RAM_SECTIONS)
+            lines.append(header)
+            for _ in range(rng.randint(3, 10)):
+                lines.append(_fill(rng.choice(templates), rng))
+    return "\n".join(lines[:num_lines])
+
+
+# ==========================================
+# 가격 히스토리 (하루 3회 스냅샷)
+# ==========================================
+HISTORY_SLOTS = ("10:00", "13:00", "18:00")
+
+_HISTORY_CATEGORIES = [
+    ("DDR5 RAM (데스크탑)", "삼성 DDR5 {c}G {n}"),
+    ("DDR5 RAM (노트북)", "삼성 노트북 DDR5 {c}G {n}"),
+    ("DDR4 RAM (데스크탑)", "삼성 DDR4 {c}G {n}"),
+    ("Intel CPU", "i{g} {m}00K {n}"),
+    ("그래픽카드", "RTX {m}060 {n}"),
+    ("SSD", "삼성 SSD {c}0G {n}"),
+]
+
+
+def make_product_catalog(num_products, seed=0):
+    """[(카테고리, 제품명, 기준 가격), ...]"""
+    rng = random.Random(seed)
+    catalog = []
+    for k in range(num_products):
+        category, template = _HISTORY_CATEGORIES[k % len(_HISTORY_CATEGORIES)]
+        name = template.format(c=rng.choice([4, 8, 16, 32]), g=rng.choice([3, 5, 7, 9]),
+                               m=rng.randint(1, 9), n=f"#{k}")
+        catalog.append((category, name, rng.randint(10, 500) * 1000))
+    return catalog
+
+
+class SyntheticHistory:
+    """
+    years 년치 × 하루 len(slots) 회 스냅샷 히스토리
+
+    PriceHistoryStore.replace_history 에 그대로 넘길 수 있도록 items() 를 제공하며,
+    날짜 하나씩 만들어서 넘기므로 10년치도 메모리에 한꺼번에 올리지 않습니다.
+    """
+
+    def __init__(self, years, num_products, slots=HISTORY_SLOTS, seed=0, end_date=None):
+        from datetime import date
+        self.days = int(years * 365)
+        self.slots = tuple(slots)
+        self.seed = seed
+        self.catalog = make_product_catalog(num_products, seed)
+        self.end_date = end_date or date.today()
+
+    def __len__(self):
+        return self.days
+
+    def date_keys(self):
+        from datetime import timedelta
+        start = self.end_date - timedelta(days=self.days - 1)
+        return [(start + timedelta(days=d)).strftime('%Y-%m-%d') for d in range(self.days)]
+
+    def snapshot(self, rng, prices):
+        """현재 가격(prices, 제자리 갱신)으로 스냅샷 하나"""
+        result = {}
+        for k, (category, name, _) in enumerate(self.catalog):
+            prices[k] = max(1000, prices[k] + rng.randint(-2, 2) * 500)
+            result.setdefault(category, []).append(
+                {'product': name, 'price': prices[k], 'price_formatted': f"{prices[k]:,}원"})
+        return result
+
+    def items(self):
+        rng = random.Random(self.seed)
+        prices = [base for _, _, base in self.catalog]
+        for date_key in self.date_keys():
+            yield date_key, {slot: self.snapshot(rng, prices) for slot in self.slots}
+
+    def rows(self):
+        return self.days * len(self.slots) * len(self.catalog)
+
+
+# ==========================================
+# 야후 시세 (yf.download(group_by='ticker') 형태)
+# ==========================================
+def make_yahoo_frame(tickers, num_rows, interval="1d", seed=0):
+    """무작위 보행 OHLC 를 티커별로 묶은 MultiIndex DataFrame (일부 결측 포함)"""
+    import numpy as np
+    import pandas as pd
+
+    freq = "30min" if interval == "30m" else "D"
+    index = pd.date_range(end=pd.Timestamp("2026-01-30 15:00"), periods=num_rows, freq=freq)
+    rng = np.random.default_rng(seed)
+    parts = {}
+    for ticker in tickers:
+        close = 100 + rng.standard_normal(num_rows).cumsum()
+        close[rng.random(num_rows) < 0.05] = np.nan  # 휴장/누락
+        parts[ticker] = pd.DataFrame({
+            "Open": close, "High": close, "Low": close, "Close": close, "Volume": 1.0,
+        }, index=index)
+    return pd.concat(parts, axis=1)
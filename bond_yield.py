@@ -0,0 +1,333 @@
+"""
+한국 국채 금리 4중 확보 전략 (FDR → BOK → Naver → ETF대체)
+
+네 소스를 순서대로 하나씩 기다리던 방식 대신 모두 동시에 시작합니다.
+우선순위가 높은 소스가 모두 실패/종료된 상태에서 유효한 결과가 나오면 즉시 채택하고,
+낮은 순위 결과만 있는 경우에는 높은 순위 소스를 잠깐(grace) 더 기다린 뒤 채택합니다.
+전체 대기 시간은 deadline 을 넘지 않으며, 늦게 끝나는 소스의 결과는 버려집니다.
+
+소스별 성공/실패와 응답 시간은 bond_source_health 에 기록되고,
+계속 실패하는 소스는 cool-down 동안 아예 시작하지 않습니다.
+
+외부 호출은 source_replay 를 거치므로 녹화된 응답으로도 실행할 수 있습니다 (source_replay.py 참고).
+
+cached_korea_bond_yield 는 결과를 디스크 캐시에 10분간 보관하고,
+만료된 값(재시작 직후 포함)은 바로 돌려준 뒤 백그라운드에서 다시 조회합니다.
+모든 소스가 실패하면 None(또는 이전 값)을 1분간 캐시해서 실행마다 deadline 만큼 기다리지 않게 합니다.
+
+무거운 라이브러리(FDR, cloudscraper, bs4, yfinance)는 해당 전략이 처음 실행될 때 불러옵니다.
+"""
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timedelta
+
+from disk_cache import response_cache
+from http_client import http_client
+from source_replay import source_replay
+from run_metrics import run_metrics
+from source_health import SourceHealthRegistry
+
+BOND_DEADLINE_SECONDS = 8.0
+BOND_GRACE_SECONDS = 1.5
+BOND_CACHE_TTL_SECONDS = 600
+BOND_FAILURE_TTL_SECONDS = 60  # 모든 소스가 실패했을 때 다시 조회하기까지
+
+# 느린 소스가 끝날 때까지 스레드를 점유하므로 호출마다 새로 만들지 않고 공유
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="bond-yield")
+
+bond_source_health = SourceHealthRegistry()
+
+NAVER_HOST = "finance.naver.com"
+
+
+def _naver_session():
+    """네이버 금융용 cloudscraper 세션 (챌린지 풀이 결과를 호출 간에 재사용)"""
+    import cloudscraper
+    return cloudscraper.create_scraper(
+        browser={'browser': 'chrome', 'platform': 'windows', 'mobile': False}
+    )
+
+http_client.register_session_factory(NAVER_HOST, _naver_session)
+
+
+# ==========================================
+# 전략별 조회 함수 (실패 시 예외 또는 None)
+# ==========================================
+def fetch_fdr(naver_code, etf_ticker):
+    """전략 1: FinanceDataReader (Investing.com 소스)"""
+    fdr_symbol = "KR3YT=RR" if "03Y" in naver_code else "KR10YT=RR"
+    start_date = (datetime.now() - timedelta(days=10)).strftime('%Y-%m-%d')
+
+    def read():
+        import FinanceDataReader as fdr
+        return fdr.DataReader(fdr_symbol, start=start_date)
+    df = source_replay.call("fdr", f"fdr:{fdr_symbol}", read)
+
+    if df is None or df.empty: raise Exception("Empty Data")
+
+    latest = float(df['Close'].iloc[-1])
+    prev = float(df['Close'].iloc[-2])
+    delta = latest - prev
+    pct = (delta / prev) * 100
+
+    return {
+        "current": latest, "delta": delta, "delta_pct": pct,
+        "source_type": "FDR", "is_fallback": False, "history": None
+    }
+
+def fetch_bok(naver_code, etf_ticker):
+    """전략 2: 한국은행 API (공식 데이터)"""
+    # 한국은행 경제통계시스템 (인증키 불필요한 공개 데이터)
+    stat_code = "817Y002" if "03Y" in naver_code else "817Y004"  # 국고채 3년/10년
+    url = f"https://ecos.bok.or.kr/api/StatisticSearch/sample/json/kr/1/10/{stat_code}/D/"
+
+    # 최근 날짜 2개 요청
+    end_date = datetime.now().strftime('%Y%m%d')
+    start_date = (datetime.now() - timedelta(days=7)).strftime('%Y%m%d')
+    url += f"{start_date}/{end_date}/"
+
+    data = source_replay.call("bok", f"bok:{stat_code}", lambda: http_client.get(url, timeout=5).json())
+
+    if 'StatisticSearch' in data and 'row' in data['StatisticSearch']:
+        rows = data['StatisticSearch']['row']
+        if len(rows) >= 2:
+            latest = float(rows[-1]['DATA_VALUE'])
+            prev = float(rows[-2]['DATA_VALUE'])
+            delta = latest - prev
+            pct = (delta / prev) * 100
+
+            return {
+                "current": latest, "delta": delta, "delta_pct": pct,
+                "source_type": "BOK", "is_fallback": False, "history": None
+            }
+    return None
+
+def fetch_naver(naver_code, etf_ticker):
+    """전략 3: CloudScraper (네이버 크롤링)"""
+    from bs4 import BeautifulSoup
+    url = f"https://{NAVER_HOST}/marketindex/interestDetail.naver?marketindexCd={naver_code}"
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7'
+    }
+    html = source_replay.call("naver", f"naver:{naver_code}",
+                              lambda: http_client.get(url, timeout=5, headers=headers).text)
+    soup = BeautifulSoup(html, 'html.parser')
+
+    value_str = soup.select_one('div.head_info > span.value').text
+    value = float(value_str.replace(',', ''))
+
+    change_str = soup.select_one('div.head_info > span.change').text
+    change_val = float(change_str.replace(',', '').strip())
+
+    direction = soup.select_one('div.head_info > span.blind').text
+    if "하락" in direction: change_val = -change_val
+    elif "보합" in direction: change_val = 0.0
+
+    prev = value - change_val
+    pct = (change_val / prev) * 100 if prev != 0 else 0
+
+    return {
+        "current": value, "delta": change_val, "delta_pct": pct,
+        "source_type": "Naver", "is_fallback": False, "history": None
+    }
+
+def fetch_etf(naver_code, etf_ticker):
+    """전략 4: ETF 가격 그대로 표시 (금리 변환 포기)"""
+    import pandas as pd
+
+    def download():
+        import yfinance as yf
+        return yf.download(etf_ticker, period="5d", interval="1d", progress=False)
+    df = source_replay.call("etf", f"etf:{etf_ticker}", download)
+
+    # MultiIndex 처리
+    if isinstance(df.columns, pd.MultiIndex):
+        try:
+            if etf_ticker in df.columns.get_level_values(1):
+                df = df.xs(etf_ticker, level=1, axis=1)
+            else:
+                df = df.xs('Close', level=0, axis=1)
+        except Exception:
+            df = df.iloc[:, 0].to_frame()
+
+    if 'Close' in df.columns: series = df['Close']
+    else: series = df.iloc[:, 0]
+
+    series = series.dropna()
+    if series.empty: return None
+
+    latest = float(series.iloc[-1])
+    prev = float(series.iloc[-2])
+    delta = latest - prev
+    pct = (delta / prev) * 100
+
+    # ETF는 가격으로 표시 (금리 아님)
+    return {
+        "current": latest,
+        "delta": delta,
+        "delta_pct": pct,
+        "source_type": "ETF대체",
+        "is_fallback": True,  # 가격 단위
+        "history": None
+    }
+
+# 우선순위 순서
+BOND_STRATEGIES = [
+    ("FDR", fetch_fdr),
+    ("BOK", fetch_bok),
+    ("Naver", fetch_naver),
+    ("ETF대체", fetch_etf),
+]
+
+
+# ==========================================
+# 동시 조회
+# ==========================================
+def _run_strategy(name, strategy, naver_code, etf_ticker, health, stop_at):
+    """
+    전략 실행 + 상태 기록 (경주에서 버려진 결과도 기록은 남김)
+
+    HTTP 요청은 stop_at(경주 마감) 안에서만 타임아웃/재시도하므로 버려진 소스가 공유 스레드를 오래 잡지 않습니다.
+    """
+    started = time.monotonic()
+    try:
+        with http_client.deadline(stop_at):
+            result = strategy(naver_code, etf_ticker)
+    except Exception as e:
+        health.record_failure(name, time.monotonic() - started, f"{type(e).__name__}: {e}")
+        return None
+
+    if not result:
+        health.record_failure(name, time.monotonic() - started, "빈 응답")
+        return None
+    health.record_success(name, time.monotonic() - started)
+    return result
+
+def _release_if_cancelled(future, name, health):
+    """실행 전에 취소된 전략은 결과를 기록하지 못하므로 half-open 시험 호출 자리를 돌려줌"""
+    if future.cancelled():
+        health.release_trial(name)
+
+def fetch_korea_bond_yield(naver_code, etf_ticker, strategies=None,
+                           deadline=BOND_DEADLINE_SECONDS, grace=BOND_GRACE_SECONDS, health=None):
+    """모든 전략을 동시에 시작하고 우선순위를 고려해 첫 유효 결과를 반환 (모두 실패 시 None)"""
+    strategies = BOND_STRATEGIES if strategies is None else strategies
+    health = bond_source_health if health is None else health
+    started = time.monotonic()
+    hard_stop = started + deadline
+
+    # 차단 중인 소스는 건너뜀 (전부 차단이면 조회하지 않음, cool-down 이 끝나면 시험 호출로 다시 시도)
+    active = [(name, strategy) for name, strategy in strategies if health.allow(name)]
+    if not active:
+        return None
+
+    futures = {
+        _executor.submit(_run_strategy, name, strategy, naver_code, etf_ticker, health, hard_stop): rank
+        for rank, (name, strategy) in enumerate(active)
+    }
+    for future, rank in futures.items():
+        future.add_done_callback(functools.partial(_release_if_cancelled, name=active[rank][0], health=health))
+    results = {}        # rank -> 결과 (유효한 것만)
+    finished = set()    # 끝난 rank
+    pending = set(futures)
+    best_seen_at = None  # 첫 유효 결과가 나온 시각
+
+    while pending:
+        # 현재까지 가장 높은 순위의 유효 결과
+        best_rank = min(results) if results else None
+
+        # 그보다 높은 순위가 모두 끝났으면 더 기다릴 필요 없음
+        if best_rank is not None and all(r in finished for r in range(best_rank)):
+            break
+
+        now = time.monotonic()
+        stop_at = hard_stop
+        if best_seen_at is not None:
+            stop_at = min(stop_at, best_seen_at + grace)
+        if now >= stop_at:
+            break
+
+        done, pending = wait(pending, timeout=stop_at - now, return_when=FIRST_COMPLETED)
+        for future in done:
+            rank = futures[future]
+            finished.add(rank)
+            result = future.result()
+            if result:
+                results[rank] = result
+                if best_seen_at is None:
+                    best_seen_at = time.monotonic()
+
+    # 남은 작업은 취소 (이미 실행 중이면 결과만 버림)
+    for future in pending:
+        future.cancel()
+
+    if not results:
+        return None
+    return results[min(results)]
+
+
+# ==========================================
+# 디스크 캐시 (만료된 값은 보여주고 뒤에서 갱신)
+# ==========================================
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def _bond_cache_key(naver_code, etf_ticker):
+    return f"bond:{naver_code}:{etf_ticker}"
+
+def _fetch_and_store(naver_code, etf_ticker, cache):
+    """
+    조회 후 캐시에 저장
+
+    모두 실패하면 이전 값(없으면 None)을 BOND_FAILURE_TTL_SECONDS 동안 캐시합니다.
+    실패를 캐시하지 않으면 소스가 모두 죽었을 때 실행마다 카드별로 deadline 만큼 기다리게 됩니다.
+    """
+    key = _bond_cache_key(naver_code, etf_ticker)
+    result = fetch_korea_bond_yield(naver_code, etf_ticker)
+    if result:
+        cache.set(key, result, BOND_CACHE_TTL_SECONDS)
+        return result
+    previous = cache.get(key)
+    result = previous.value if previous is not None else None
+    cache.set(key, result, BOND_FAILURE_TTL_SECONDS)
+    return result
+
+def _refresh_in_background(naver_code, etf_ticker, cache):
+    """같은 키에 대해 동시에 하나만 갱신"""
+    key = _bond_cache_key(naver_code, etf_ticker)
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def run():
+        try:
+            _fetch_and_store(naver_code, etf_ticker, cache)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=run, name=f"bond-refresh-{naver_code}", daemon=True).start()
+
+def cached_korea_bond_yield(naver_code, etf_ticker, cache=None):
+    """
+    디스크 캐시 우선 조회 (만료된 값은 그대로 반환하고 백그라운드 갱신, 없으면 바로 조회)
+
+    캐시된 실패(None)도 값과 같이 다룹니다 (만료 전에는 None, 만료 뒤에는 None 을 주고 백그라운드 갱신).
+    """
+    if cache is None and not source_replay.persistent:
+        # record/replay 모드는 디스크 캐시를 건너뜀 (항상 소스를 거쳐 녹화/지연·실패 주입이 적용되게)
+        run_metrics.mark()
+        return fetch_korea_bond_yield(naver_code, etf_ticker)
+    cache = response_cache if cache is None else cache
+    entry = cache.get(_bond_cache_key(naver_code, etf_ticker))
+    if entry is None:
+        run_metrics.mark()
+        return _fetch_and_store(naver_code, etf_ticker, cache)
+    if not entry.fresh:
+        run_metrics.mark("stale")
+        _refresh_in_background(naver_code, etf_ticker, cache)
+    return entry.value
@@ -0,0 +1,80 @@
+"""
+합성 지표 (교차 환율, 단위 환산, 스프레드)
+
+기준 티커 종가로부터 계산되는 지표를 표 하나로 선언합니다.
+입력 티커끼리 시각이 다르면 직전 값(as-of)으로 맞춘 뒤 열 단위로 한 번에 계산하므로,
+지표를 추가해도 다운로드나 카드 렌더링 중 계산이 늘지 않습니다.
+"""
+from collections import namedtuple
+
+import pandas as pd
+
+# op: 'ratio' (a / b), 'spread' (a - b), 'scale' (a * factor)
+DerivedSeries = namedtuple("DerivedSeries", ["name", "op", "inputs", "factor"])
+
+
+def ratio(name, numerator, denominator):
+    return DerivedSeries(name, "ratio", (numerator, denominator), 1.0)
+
+
+def spread(name, left, right, factor=1.0):
+    return DerivedSeries(name, "spread", (left, right), factor)
+
+
+def scale(name, ticker, factor):
+    return DerivedSeries(name, "scale", (ticker,), factor)
+
+
+DERIVED_SERIES = [
+    ratio("CALC_CNYKRW", "KRW=X", "CNY=X"),      # 원/위안 = 원/달러 ÷ 위안/달러
+    scale("JPYKRW_100", "JPYKRW=X", 100),        # 원/엔 (100엔 기준)
+]
+DERIVED_NAMES = {d.name for d in DERIVED_SERIES}
+
+
+def base_tickers(definitions=DERIVED_SERIES):
+    """합성 지표 계산에 필요한 기준 티커 (합성 지표끼리 참조하는 경우 제외)"""
+    names = {d.name for d in definitions}
+    needed = []
+    for d in definitions:
+        for ticker in d.inputs:
+            if ticker not in names and ticker not in needed:
+                needed.append(ticker)
+    return needed
+
+
+def _aligned_inputs(closes, inputs):
+    """입력 열들을 직전 값으로 맞춤 (입력 중 하나라도 관측된 시각만, 모두 값이 생긴 이후부터)"""
+    frame = closes[list(inputs)]
+    observed = frame.notna().any(axis=1)
+    return frame.ffill()[observed].dropna()
+
+
+def compute_derived(closes, definitions=DERIVED_SERIES):
+    """
+    종가 표에 합성 지표 열을 추가해서 반환 (입력이 없는 지표는 건너뜀)
+
+    정의 순서대로 계산하므로 앞에서 만든 합성 지표를 뒤의 입력으로 쓸 수 있습니다.
+    """
+    if closes is None or closes.empty:
+        return closes
+
+    columns = {}
+    for d in definitions:
+        if any(t not in closes and t not in columns for t in d.inputs):
+            continue
+        source = closes.join(pd.DataFrame(columns), how="left") if columns else closes
+        aligned = _aligned_inputs(source, d.inputs)
+        if d.op == "ratio":
+            series = aligned.iloc[:, 0] / aligned.iloc[:, 1]
+        elif d.op == "spread":
+            series = (aligned.iloc[:, 0] - aligned.iloc[:, 1]) * d.factor
+        elif d.op == "scale":
+            series = aligned.iloc[:, 0] * d.factor
+        else:
+            raise ValueError(f"알 수 없는 합성 연산: {d.op}")
+        columns[d.name] = series.reindex(closes.index)
+
+    if not columns:
+        return closes
+    return pd.concat([closes, pd.DataFrame(columns, index=closes.index)], axis=1)
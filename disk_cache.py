@@ -0,0 +1,178 @@
+"""
+재시작 후에도 남는 디스크 캐시 (TTL + 용량 제한 LRU + 원자적 쓰기)
+
+st.cache_data 는 프로세스 메모리에만 있어서 재배포/재시작 직후에는 모든 외부 요청이 한꺼번에 몰립니다.
+이 캐시는 값을 .cache/responses 아래 pickle 파일로 남겨 두고,
+재시작한 프로세스는 만료 여부와 관계없이 마지막 값을 먼저 보여준 뒤 뒤에서 갱신할 수 있게 합니다.
+
+- 만료(TTL)된 값도 지우지 않고 fresh=False 로 돌려줌 (호출하는 쪽에서 갱신 결정)
+- 전체 크기가 max_bytes 를 넘으면 가장 오래 쓰지 않은 파일부터 삭제
+- 임시 파일에 쓴 뒤 os.replace 로 교체하므로 쓰는 도중에 죽어도 깨진 파일이 남지 않음
+"""
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from source_replay import source_replay
+
+RESPONSE_CACHE_DIR = source_replay.cache_dir("responses")  # record/replay 모드는 fixtures 아래 따로
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class CacheEntry(namedtuple("CacheEntry", ["value", "stored_at", "expires_at"])):
+    @property
+    def fresh(self):
+        return time.time() < self.expires_at
+
+
+class DiskCache:
+    """키 -> 값 디스크 캐시 (읽은 값은 메모리에도 보관, 스레드 안전)"""
+
+    def __init__(self, cache_dir=RESPONSE_CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._memory = {}            # key -> CacheEntry
+        self._files = None           # 파일명 -> 크기 (사용 순서, 처음 쓸 때 디렉터리를 훑어서 만듦)
+        self._total_bytes = 0
+
+    # ------------------------------------------
+    # 파일 목록 (LRU 순서)
+    # ------------------------------------------
+    def _path(self, key):
+        """'bond:IRr_GOV03Y:...' -> bond-<sha1>.pkl (키의 ':' 앞부분을 파일명 앞에 붙여 묶음 삭제에 사용)"""
+        namespace = re.sub(r'[^0-9A-Za-z_]', '_', key.split(':', 1)[0])
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{namespace}-{digest}.pkl")
+
+    def _scan(self):
+        if self._files is not None:
+            return
+        found = []
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".pkl"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, name, stat.st_size))
+        found.sort()
+        self._files = OrderedDict((name, size) for _, name, size in found)
+        self._total_bytes = sum(self._files.values())
+
+    def _touch(self, path):
+        name = os.path.basename(path)
+        if name in self._files:
+            self._files.move_to_end(name)
+            try:
+                os.utime(path)  # 재시작 후에도 사용 순서 유지
+            except OSError:
+                pass
+
+    def _forget(self, name):
+        self._total_bytes -= self._files.pop(name, 0)
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._files) > 1:
+            name, _ = next(iter(self._files.items()))
+            self._forget(name)
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+        self._memory = {k: v for k, v in self._memory.items()
+                        if os.path.basename(self._path(k)) in self._files}
+
+    # ------------------------------------------
+    # 읽기/쓰기
+    # ------------------------------------------
+    def get(self, key):
+        """CacheEntry 반환 (없거나 읽을 수 없으면 None, 만료된 값도 반환)"""
+        path = self._path(key)
+        with self._lock:
+            self._scan()
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._touch(path)
+                return entry
+            if os.path.basename(path) not in self._files:
+                return None
+
+        try:
+            with open(path, 'rb') as f:
+                stored = pickle.load(f)
+            entry = CacheEntry(stored['value'], stored['stored_at'], stored['expires_at'])
+        except Exception as e:
+            print(f"Error reading disk cache {key}: {e}")
+            return None
+
+        with self._lock:
+            self._memory[key] = entry
+            self._touch(path)
+        return entry
+
+    def set(self, key, value, ttl):
+        """값 저장 (ttl 초 뒤 만료)"""
+        now = time.time()
+        entry = CacheEntry(value, now, now + ttl)
+        path = self._path(key)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({'value': value, 'stored_at': now, 'expires_at': now + ttl},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error writing disk cache {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return entry
+
+        name = os.path.basename(path)
+        with self._lock:
+            self._scan()
+            self._forget(name)
+            self._files[name] = size
+            self._total_bytes += size
+            self._memory[key] = entry
+            self._evict()
+        return entry
+
+    def delete(self, key):
+        path = self._path(key)
+        with self._lock:
+            self._scan()
+            self._memory.pop(key, None)
+            self._forget(os.path.basename(path))
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self, namespace=None):
+        """namespace('bond:...' 의 'bond') 에 속한 키 삭제 (None 이면 전체)"""
+        prefix = f"{namespace}-" if namespace else ""
+        with self._lock:
+            self._scan()
+            names = [name for name in self._files if name.startswith(prefix)]
+            for name in names:
+                self._forget(name)
+            self._memory = {k: v for k, v in self._memory.items()
+                            if not os.path.basename(self._path(k)).startswith(prefix)}
+        for name in names:
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+
+
+response_cache = DiskCache()
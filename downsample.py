@@ -0,0 +1,70 @@
+"""
+차트용 다운샘플링 (Largest-Triangle-Three-Buckets)
+
+점이 많아도 화면에 보낼 점 개수를 point_budget 이하로 고정합니다.
+구간마다 앞뒤 점과 만드는 삼각형 면적이 가장 큰 점을 고르므로
+급등/급락 같은 모양은 남고, 평탄한 구간의 점만 줄어듭니다.
+"""
+
+DEFAULT_POINT_BUDGET = 300
+
+
+def lttb_indices(y, point_budget=DEFAULT_POINT_BUDGET, x=None):
+    """
+    남길 점의 위치 목록 (오름차순, 첫 점/마지막 점 항상 포함)
+
+    Args:
+        y: 값 목록
+        point_budget: 남길 최대 점 개수 (3 미만이면 양 끝만)
+        x: 가로 좌표 목록 (None이면 0, 1, 2, ... 등간격)
+    """
+    n = len(y)
+    if n <= point_budget or n <= 2:
+        return list(range(n))
+    if point_budget < 3:
+        return [0, n - 1]
+    if x is None:
+        x = range(n)
+
+    indices = [0]
+    # 양 끝을 뺀 나머지를 point_budget - 2 개 구간으로 나눔
+    bucket_size = (n - 2) / (point_budget - 2)
+    a = 0
+    for b in range(point_budget - 2):
+        start = int(b * bucket_size) + 1
+        end = int((b + 1) * bucket_size) + 1
+
+        # 다음 구간의 평균점 (마지막 구간이면 마지막 점)
+        next_start = end
+        next_end = min(int((b + 2) * bucket_size) + 1, n)
+        if next_start >= n - 1:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        else:
+            count = next_end - next_start
+            avg_x = sum(x[next_start:next_end]) / count
+            avg_y = sum(y[next_start:next_end]) / count
+
+        ax, ay = x[a], y[a]
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            area = abs((ax - avg_x) * (y[i] - ay) - (ax - x[i]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = i, area
+        indices.append(best)
+        a = best
+
+    indices.append(n - 1)
+    return indices
+
+
+def lttb(x, y, point_budget=DEFAULT_POINT_BUDGET, x_values=None):
+    """
+    (x, y) 를 point_budget 개 이하로 줄여서 반환
+
+    x 는 그대로 돌려줄 값(날짜 문자열 등)이고, 면적 계산에는 x_values(예: epoch 초)를 씁니다.
+    x_values 가 없으면 등간격으로 봅니다.
+    """
+    keep = lttb_indices(y, point_budget, x_values)
+    if len(keep) == len(y):
+        return list(x), list(y)
+    return [x[i] for i in keep], [y[i] for i in keep]
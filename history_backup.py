@@ -0,0 +1,127 @@
+"""
+RAM 가격 히스토리 백업/복원 (날짜 단위 스트리밍)
+
+히스토리 전체를 들여쓰기 JSON 문자열 하나로 만들고 메모리에서 gzip 하던 방식 대신,
+한 줄에 한 날짜씩(JSON Lines) gzip 스트림으로 임시 파일에 써 내려갑니다.
+복원도 한 줄씩 읽어 날짜 단위로 DB 에 반영하므로 히스토리가 커져도 메모리 사용량이 일정합니다.
+
+파일 형식 (.jsonl.gz)
+    {"format": "ram-history-backup", "version": 2, "kind": "full", "history_version": 42, ...}   <- 헤더
+    {"date": "2026-01-30", "slots": {"10:00": {"DDR5": [{"product": ..., "price": ...}]}}}
+    {"date": "2026-01-31", "deleted": true}                                              <- 증분 백업의 삭제
+
+- kind: full (전체) / delta (since_version 이후 바뀐 날짜만) / month (특정 달만)
+- 구 형식(시간대 없이 날짜만) 데이터는 복원할 때 DAILY_SLOT 시간대로 들어감
+- 예전 형식({'price_data': ..., 'price_history': {...}} 단일 JSON)도 그대로 복원 가능
+"""
+import gzip
+import io
+import json
+import tempfile
+from datetime import datetime
+from itertools import groupby
+
+from price_store import normalize_history
+
+BACKUP_FORMAT = "ram-history-backup"
+BACKUP_FORMAT_VERSION = 2
+SPOOL_MAX_BYTES = 4 * 1024 * 1024  # 이보다 큰 백업은 디스크 임시 파일로 넘어감
+
+
+def write_backup(store, fileobj, price_data=None, kind="full", month=None):
+    """
+    백업을 fileobj 에 gzip JSON Lines 로 기록 -> (헤더, 날짜 수)
+
+    full / delta 백업은 끝난 뒤 현재 버전을 '마지막 백업' 으로 기록합니다 (다음 증분 백업의 기준).
+    """
+    version = store.version()
+    since_version = store.last_backup_version() if kind == "delta" else None
+    if kind == "delta" and since_version is None:
+        kind = "full"  # 한 번도 백업하지 않았으면 전체 백업
+
+    header = {
+        'format': BACKUP_FORMAT,
+        'version': BACKUP_FORMAT_VERSION,
+        'kind': kind,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'history_version': version,
+        'since_version': since_version,
+        'month': month if kind == "month" else None,
+        'price_data': price_data or {},
+    }
+    count = 0
+    with gzip.GzipFile(fileobj=fileobj, mode='wb', mtime=0) as gz:
+        writer = io.TextIOWrapper(gz, encoding='utf-8')
+        writer.write(json.dumps(header, ensure_ascii=False) + "\n")
+        for date_key, slots in store.iter_dates(since_version=since_version,
+                                                month=month if kind == "month" else None):
+            record = {'date': date_key, 'deleted': True} if slots is None else {'date': date_key, 'slots': slots}
+            writer.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n")
+            count += 1
+        writer.flush()
+        writer.detach()
+
+    if kind in ("full", "delta"):
+        store.mark_backup(version)
+    return header, count
+
+
+def backup_file(store, price_data=None, kind="full", month=None):
+    """다운로드 버튼용: 백업을 임시 파일(작으면 메모리)에 만들어 처음 위치로 되돌려 반환"""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    write_backup(store, spool, price_data, kind=kind, month=month)
+    spool.seek(0)
+    return spool
+
+
+def _open_text(fileobj):
+    """gzip 이면 풀면서 읽는 텍스트 스트림"""
+    head = fileobj.read(2)
+    fileobj.seek(0)
+    raw = gzip.GzipFile(fileobj=fileobj, mode='rb') if head == b'\x1f\x8b' else fileobj
+    return io.TextIOWrapper(raw, encoding='utf-8')
+
+
+def _legacy_records(history):
+    """예전 단일 JSON 의 price_history -> (날짜, {시간대: {카테고리: [항목]}})"""
+    rows = sorted(normalize_history(history), key=lambda row: row.date)
+    for date_key, date_rows in groupby(rows, key=lambda row: row.date):
+        slots = {}
+        for row in date_rows:
+            slots.setdefault(row.slot, {}).setdefault(row.category, []).append(
+                {'product': row.product, 'price': row.price})
+        yield date_key, slots
+
+
+def restore_backup(store, fileobj):
+    """
+    백업 파일(gzip 여부 자동 판별)을 날짜 단위로 DB 에 병합 -> (헤더, 교체 날짜 수, 삭제 날짜 수)
+
+    전체 백업은 백업에 없는 날짜를 지우고, 증분/월별 백업은 들어 있는 날짜만 교체합니다.
+    헤더의 price_data 는 호출하는 쪽에서 저장합니다.
+    """
+    text = _open_text(fileobj)
+    first_line = text.readline()
+    try:
+        header = json.loads(first_line)
+    except ValueError:
+        header = None
+
+    if not isinstance(header, dict) or header.get('format') != BACKUP_FORMAT:
+        # 예전 형식: 파일 전체가 JSON 하나
+        legacy = json.loads(first_line + text.read())
+        header = {'format': 'legacy', 'kind': 'full', 'price_data': legacy.get('price_data')}
+        if 'price_history' not in legacy:
+            return header, 0, 0
+        replaced, deleted = store.merge_dates(_legacy_records(legacy['price_history']), replace_all=True)
+        return header, replaced, deleted
+
+    def records():
+        for line in text:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield record['date'], (None if record.get('deleted') else record.get('slots', {}))
+
+    replaced, deleted = store.merge_dates(records(), replace_all=header.get('kind') == "full")
+    return header, replaced, deleted
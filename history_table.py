@@ -0,0 +1,319 @@
+"""
+RAM 가격 히스토리의 메모리 표현 (열 단위 배열)
+
+히스토리 전체를 날짜 -> 시간대 -> 카테고리 -> [{'product', 'price', 'price_formatted'}] 중첩 dict 로
+만들던 방식 대신, 문자열은 사전(제품/카테고리 이름 -> 정수 id)에 한 번씩만 두고
+행은 스냅샷 번호 / 카테고리 id / 제품 id / 가격을 담은 int32 배열 네 개로 보관합니다.
+
+DB 에도 스냅샷마다 (카테고리 id, 제품 id, 가격) 배열을 BLOB 으로 남겨 두므로(encode_snapshot)
+불러올 때는 행을 하나씩 읽지 않고 스냅샷 수만큼의 BLOB 만 이어 붙입니다(from_columns).
+
+- 스냅샷 = (날짜, 시간대) 하나, 정렬 순서대로 번호를 매기고 시각(epoch 초) 배열을 따로 둠
+- 제품별 조회용으로 (제품, 스냅샷) 순 행 번호 배열 + 제품별 시작 위치를 만들어 둠
+  (기간 조회는 searchsorted 로 시작 위치만 찾아 잘라냄)
+- 'price_formatted' 같은 표시용 문자열은 저장하지 않고 화면에 그릴 때 만듦
+- 저장/삭제는 기본 표를 다시 만들지 않고 바뀐 스냅샷만 덧붙인 새 표로 반영 (PriceHistoryTable 참고)
+"""
+import bisect
+import copy
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+
+INT32_MAX = 2 ** 31 - 1
+_PRICE_DTYPES = {4: '<i4', 8: '<i8'}
+
+
+def _snapshot_label(date_key, time_slot):
+    return f"{date_key} {time_slot}"
+
+
+def _snapshot_timestamp(date_key, time_slot):
+    """스냅샷 시각 (epoch 초)"""
+    try:
+        return int(datetime.fromisoformat(f"{date_key} {time_slot}").timestamp())
+    except ValueError:
+        return 0
+
+
+class NameDictionary:
+    """이름 <-> 정수 id"""
+
+    def __init__(self, names=()):
+        self.names = list(names)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+
+    def copy(self):
+        return NameDictionary(self.names)
+
+    def id(self, name):
+        found = self.ids.get(name)
+        if found is None:
+            found = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return found
+
+
+class _Segment(namedtuple("_Segment", ["rows", "prices"])):
+    """저장 후 덧붙인 스냅샷 1개: rows = [(카테고리, 제품, 가격)], prices = {제품: 가격} (같은 제품은 첫 번째)"""
+
+    @classmethod
+    def from_rows(cls, rows):
+        prices = {}
+        for _, product, price in rows:
+            prices.setdefault(product, price)
+        return cls(rows, prices)
+
+
+class PriceHistoryTable:
+    """
+    날짜/시간대별 스냅샷을 열 단위 배열로 보관하는 히스토리 (읽기 전용)
+
+    여러 세션이 같은 객체를 동시에 읽으므로 만든 뒤에는 바꾸지 않습니다.
+    스냅샷 교체/날짜 삭제는 새 표를 돌려주는데, 큰 배열(기본 표)은 그대로 공유하고
+    바뀐 스냅샷만 덧붙인 스냅샷(_overlay)과 가려진 기본 스냅샷 표시(_dead)로 담습니다.
+    그래서 저장 한 번의 비용은 히스토리 크기와 상관없이 바뀐 스냅샷 크기에만 비례합니다.
+    덧붙인 스냅샷이 많아지면(pending_changes) 저장소가 DB 의 BLOB 에서 기본 표를 다시 만듭니다.
+    """
+
+    def __init__(self, snapshot_keys, categories, products, row_snapshot, row_category, row_product, row_price):
+        self._categories = categories
+        self._products = products
+        self._set_snapshots(snapshot_keys)
+        self.row_snapshot = row_snapshot
+        self.row_category = row_category
+        self.row_product = row_product
+        self.row_price = row_price
+        self._build_product_index()
+        self._overlay = {}  # (날짜, 시간대) -> _Segment
+        self._dead = np.zeros(len(self.snapshot_keys), dtype=bool)
+        self._dead_count = 0
+        self.dates = list(self._base_dates)
+
+    @classmethod
+    def from_columns(cls, category_names, product_names, snapshots):
+        """
+        DB 의 사전 + 스냅샷 BLOB 에서 생성
+
+        snapshots: (date, time_slot, category_ids, product_ids, prices, price_width) 를 날짜/시간대 순으로
+        """
+        keys, counts, categories, products, prices = [], [], [], [], []
+        for date_key, time_slot, category_ids, product_ids, price_bytes, price_width in snapshots:
+            keys.append((date_key, time_slot))
+            counts.append(len(category_ids) // 4)
+            categories.append(category_ids)
+            products.append(product_ids)
+            prices.append(np.frombuffer(price_bytes, dtype=_PRICE_DTYPES[price_width]))
+        return cls(keys, NameDictionary(category_names), NameDictionary(product_names),
+                   np.repeat(np.arange(len(keys), dtype=np.int32), counts),
+                   np.frombuffer(b"".join(categories), dtype='<i4').astype(np.int32),
+                   np.frombuffer(b"".join(products), dtype='<i4').astype(np.int32),
+                   _price_array(np.concatenate(prices) if prices else np.zeros(0, dtype=np.int64)))
+
+    # ------------------------------------------
+    # 내부 인덱스 (기본 표)
+    # ------------------------------------------
+    def _set_snapshots(self, snapshot_keys):
+        self.snapshot_keys = list(snapshot_keys)
+        self.snapshot_ts = np.array([_snapshot_timestamp(d, s) for d, s in self.snapshot_keys], dtype=np.int64)
+        dates = []
+        snapshot_day = []
+        for date_key, _ in self.snapshot_keys:
+            if not dates or dates[-1] != date_key:
+                dates.append(date_key)
+            snapshot_day.append(len(dates) - 1)
+        self._base_dates = dates
+        self.snapshot_day = np.array(snapshot_day, dtype=np.int32)
+
+    def _build_product_index(self):
+        # (제품, 스냅샷) 순 정렬 (같은 스냅샷에 같은 제품이 여러 번 있으면 첫 번째만)
+        order = np.lexsort((self.row_snapshot, self.row_product)).astype(np.int32)
+        products = self.row_product[order]
+        snapshots = self.row_snapshot[order]
+        keep = np.ones(len(order), dtype=bool)
+        keep[1:] = (products[1:] != products[:-1]) | (snapshots[1:] != snapshots[:-1])
+        self._product_rows = order[keep]
+        counts = np.bincount(self.row_product[self._product_rows], minlength=len(self._products.names))
+        self._product_offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+    def _rows_for(self, product_name):
+        product_id = self._products.ids.get(product_name)
+        if product_id is None or product_id + 1 >= len(self._product_offsets):
+            return self._product_rows[:0]
+        return self._product_rows[self._product_offsets[product_id]:self._product_offsets[product_id + 1]]
+
+    def _base_position(self, key):
+        pos = bisect.bisect_left(self.snapshot_keys, key)
+        if pos < len(self.snapshot_keys) and self.snapshot_keys[pos] == key:
+            return pos
+        return None
+
+    def _alive_rows(self):
+        """가려지지 않은 기본 표 행 (가려진 스냅샷이 없으면 전체 slice)"""
+        if not self._dead_count:
+            return slice(None)
+        return ~self._dead[self.row_snapshot]
+
+    # ------------------------------------------
+    # 조회
+    # ------------------------------------------
+    def __len__(self):
+        alive = self._alive_rows()
+        base = len(self.row_price) if isinstance(alive, slice) else int(np.count_nonzero(alive))
+        return base + sum(len(segment.rows) for segment in self._overlay.values())
+
+    def pending_changes(self):
+        """기본 표를 만든 뒤 덧붙이거나 가린 스냅샷 수"""
+        return len(self._overlay) + self._dead_count
+
+    def trend(self, product_name, cutoff_date):
+        """cutoff_date(YYYY-MM-DD) 이후의 [{'date': 라벨, 'price': 가격}, ...]"""
+        first_key = (cutoff_date,)
+        rows = self._rows_for(product_name)
+        snapshots = self.row_snapshot[rows]
+        start = int(np.searchsorted(snapshots, bisect.bisect_left(self.snapshot_keys, first_key)))
+        snapshots, prices = snapshots[start:], self.row_price[rows[start:]]
+        if self._dead_count:
+            alive = ~self._dead[snapshots]
+            snapshots, prices = snapshots[alive], prices[alive]
+        points = [(self.snapshot_keys[s], price) for s, price in zip(snapshots.tolist(), prices.tolist())]
+
+        added = [(key, segment.prices[product_name]) for key, segment in self._overlay.items()
+                 if key >= first_key and product_name in segment.prices]
+        if added:
+            points = sorted(points + added)
+        return [{'date': _snapshot_label(*key), 'price': price} for key, price in points]
+
+    def product_dates(self, product_name):
+        """제품이 등록된 날짜 목록 (중복 제거, 정렬)"""
+        snapshots = self.row_snapshot[self._rows_for(product_name)]
+        if self._dead_count:
+            snapshots = snapshots[~self._dead[snapshots]]
+        dates = [self._base_dates[d] for d in np.unique(self.snapshot_day[snapshots]).tolist()]
+        added = {key[0] for key, segment in self._overlay.items() if product_name in segment.prices}
+        if added:
+            dates = sorted(added.union(dates))
+        return dates
+
+    def date_summary(self):
+        """날짜별 [(날짜, 카테고리 수, 제품 수)] (날짜 오름차순, 모든 시간대 합산)"""
+        alive = self._alive_rows()
+        row_day = self.snapshot_day[self.row_snapshot[alive]]
+        row_category = self.row_category[alive]
+        width = max(len(self._categories.names), 1)
+        product_counts = np.bincount(row_day, minlength=len(self._base_dates))
+        pairs = np.unique(row_day.astype(np.int64) * width + row_category)
+        category_counts = np.bincount(pairs // width, minlength=len(self._base_dates))
+        summary = {
+            date_key: (categories, products)
+            for date_key, categories, products in zip(self._base_dates, category_counts.tolist(),
+                                                       product_counts.tolist())
+            if products
+        }
+
+        added = {}
+        for (date_key, _), segment in self._overlay.items():
+            entry = added.setdefault(date_key, [set(), 0])
+            entry[0].update(category for category, _, _ in segment.rows)
+            entry[1] += len(segment.rows)
+        if added:
+            day_index = {date_key: i for i, date_key in enumerate(self._base_dates)}
+            for date_key, (categories, count) in added.items():
+                if date_key in summary:
+                    day_categories = np.unique(row_category[row_day == day_index[date_key]])
+                    categories.update(self._categories.names[c] for c in day_categories.tolist())
+                    count += summary[date_key][1]
+                summary[date_key] = (len(categories), count)
+        return [(date_key,) + summary[date_key] for date_key in sorted(summary)]
+
+    def snapshot(self, date_key, time_slot):
+        """한 스냅샷 -> {카테고리: [{'product', 'price'}]} (없으면 빈 dict)"""
+        prices = {}
+        segment = self._overlay.get((date_key, time_slot))
+        if segment is not None:
+            for category, product, price in segment.rows:
+                prices.setdefault(category, []).append({'product': product, 'price': price})
+            return prices
+
+        pos = self._base_position((date_key, time_slot))
+        if pos is None or self._dead[pos]:
+            return prices
+        rows = np.flatnonzero(self.row_snapshot == pos)
+        for c, p, price in zip(self.row_category[rows].tolist(), self.row_product[rows].tolist(),
+                               self.row_price[rows].tolist()):
+            prices.setdefault(self._categories.names[c], []).append(
+                {'product': self._products.names[p], 'price': price})
+        return prices
+
+    def nbytes(self):
+        """배열이 차지하는 바이트 (사전 문자열, 덧붙인 스냅샷 제외)"""
+        arrays = (self.row_snapshot, self.row_category, self.row_product, self.row_price,
+                  self.snapshot_ts, self.snapshot_day, self._product_rows, self._product_offsets, self._dead)
+        return sum(a.nbytes for a in arrays)
+
+    # ------------------------------------------
+    # 같은 프로세스의 저장/삭제 반영 (새 표 반환, 기본 표 배열은 공유)
+    # ------------------------------------------
+    def replace_snapshot(self, date_key, time_slot, prices):
+        """한 날짜/시간대 스냅샷을 교체한 새 표"""
+        key = (date_key, time_slot)
+        new_rows = [
+            (category, item['product'], int(item['price']))
+            for category, items in prices.items() if isinstance(items, list)
+            for item in items if isinstance(item, dict) and 'product' in item and 'price' in item
+        ]
+        overlay = dict(self._overlay)
+        if new_rows:
+            overlay[key] = _Segment.from_rows(new_rows)
+        else:
+            overlay.pop(key, None)
+        pos = self._base_position(key)
+        return self._patched(overlay, (pos, pos + 1) if pos is not None else None)
+
+    def remove_date(self, date_key):
+        """특정 날짜의 모든 시간대를 뺀 새 표"""
+        overlay = {key: segment for key, segment in self._overlay.items() if key[0] != date_key}
+        # 날짜는 고정 길이(YYYY-MM-DD)라 date_key + "\x00" 은 그 날짜의 모든 (날짜, 시간대) 바로 뒤
+        lo = bisect.bisect_left(self.snapshot_keys, (date_key,))
+        hi = bisect.bisect_left(self.snapshot_keys, (date_key + "\x00",))
+        return self._patched(overlay, (lo, hi) if lo < hi else None)
+
+    def _patched(self, overlay, dead_range):
+        """기본 표를 공유하고 덧붙인 스냅샷/가린 범위만 바꾼 복사본"""
+        table = copy.copy(self)
+        table._overlay = overlay
+        if dead_range is not None and not self._dead[dead_range[0]:dead_range[1]].all():
+            table._dead = self._dead.copy()
+            table._dead[dead_range[0]:dead_range[1]] = True
+            table._dead_count = int(np.count_nonzero(table._dead))
+        base_dates = self._base_dates
+        if table._dead_count:
+            base_dates = [base_dates[d] for d in np.unique(self.snapshot_day[~table._dead]).tolist()]
+        added = {key[0] for key in overlay}
+        table.dates = sorted(added.union(base_dates)) if added else list(base_dates)
+        return table
+
+
+def _price_array(prices):
+    """int32 에 들어가면 int32, 아니면 int64"""
+    if len(prices) and (prices.max() > INT32_MAX or prices.min() < -INT32_MAX - 1):
+        return prices.astype(np.int64)
+    return prices.astype(np.int32)
+
+
+def encode_snapshot(rows, categories, products):
+    """
+    스냅샷 1개의 (category, product, price) 행 -> DB 저장용 (카테고리 id BLOB, 제품 id BLOB, 가격 BLOB, 가격 바이트 수)
+
+    처음 보는 이름은 사전(categories/products)에 추가되므로 호출하는 쪽에서 새 이름을 DB 에 저장해야 합니다.
+    """
+    category_ids, product_ids, prices = [], [], []
+    for category, product, price in rows:
+        category_ids.append(categories.id(category))
+        product_ids.append(products.id(product))
+        prices.append(price)
+    prices = _price_array(np.array(prices, dtype=np.int64))
+    width = prices.dtype.itemsize
+    return (np.array(category_ids, dtype='<i4').tobytes(), np.array(product_ids, dtype='<i4').tobytes(),
+            prices.astype(_PRICE_DTYPES[width]).tobytes(), width)
@@ -0,0 +1,182 @@
+"""
+공용 HTTP 클라이언트 (호스트별 세션 재사용 + 재시도 + 조건부 요청)
+
+요청마다 requests.get / cloudscraper.create_scraper() 로 새 연결(TLS 핸드셰이크, 챌린지 풀이)을
+만들던 방식 대신 호스트별 세션을 프로세스 전체에서 공유합니다.
+
+- 연결 오류, 타임아웃, 429/5xx 응답은 지터가 섞인 지수 백오프로 제한된 횟수만 재시도
+- deadline(stop_at) 안에서 보낸 요청은 남은 시간 안에서만 타임아웃/재시도 (경주하는 호출이 제한 시간을 넘겨 스레드를 잡고 있지 않게)
+- 응답에 ETag / Last-Modified 가 있으면 기억해 두었다가 다음 요청에 조건부 헤더로 보냄
+  (304 Not Modified 이면 저장해 둔 본문을 그대로 돌려줌)
+
+requests 는 첫 요청 때 불러옵니다.
+"""
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+POOL_MAXSIZE = 8          # 호스트당 유지할 연결 수
+MAX_ATTEMPTS = 3          # 최초 요청 포함
+BACKOFF_SECONDS = 0.3     # 재시도 대기 기준 (0.3, 0.6, ... 에 0.5~1.5배 지터)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+VALIDATOR_CACHE_SIZE = 128
+
+
+class HttpResponse:
+    """세션 응답에서 필요한 부분만 담은 응답 (304 로 재사용된 경우 not_modified=True)"""
+
+    def __init__(self, url, status_code, content, encoding, headers, not_modified=False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding
+        self.headers = headers
+        self.not_modified = not_modified
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+    def _reused(self):
+        return HttpResponse(self.url, self.status_code, self.content, self.encoding, self.headers,
+                            not_modified=True)
+
+
+class HttpClient:
+    """호스트별 세션 풀 (스레드 안전)"""
+
+    def __init__(self, max_attempts=MAX_ATTEMPTS, backoff_seconds=BACKOFF_SECONDS,
+                 pool_maxsize=POOL_MAXSIZE, validator_cache_size=VALIDATOR_CACHE_SIZE):
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.pool_maxsize = pool_maxsize
+        self.validator_cache_size = validator_cache_size
+        self._lock = threading.Lock()
+        self._local = threading.local()  # 스레드별 deadline
+        self._sessions = {}     # host -> Session
+        self._factories = {}    # host -> 세션 생성 함수 (cloudscraper 등)
+        self._validated = OrderedDict()  # url -> (etag, last_modified, HttpResponse)
+        self._stats = {'requests': 0, 'retries': 0, 'not_modified': 0, 'errors': 0}
+
+    def register_session_factory(self, host, factory):
+        """특정 호스트는 다른 세션(예: cloudscraper)을 쓰도록 지정 (처음 요청할 때 만들어짐)"""
+        with self._lock:
+            self._factories[host] = factory
+            self._sessions.pop(host, None)
+
+    def _session(self, host):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                factory = self._factories.get(host)
+                session = factory() if factory is not None else requests.Session()
+                if factory is None:
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                self._sessions[host] = session
+            return session
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    @contextmanager
+    def deadline(self, stop_at):
+        """이 스레드의 요청을 stop_at(time.monotonic() 기준)까지로 제한 (중첩되면 더 이른 쪽)"""
+        previous = getattr(self._local, 'deadline', None)
+        self._local.deadline = stop_at if previous is None else min(previous, stop_at)
+        try:
+            yield
+        finally:
+            self._local.deadline = previous
+
+    def get(self, url, timeout=5, headers=None, conditional=True, deadline=None):
+        """
+        GET 요청 -> HttpResponse (재시도를 모두 실패하면 마지막 예외를 그대로 올림)
+
+        4xx 같은 재시도 대상이 아닌 응답은 그대로 반환합니다.
+        deadline(time.monotonic() 기준, 없으면 이 스레드의 deadline) 이 있으면 요청 타임아웃을 남은 시간으로 줄이고,
+        남은 시간 안에 다시 보낼 수 없으면 재시도하지 않습니다.
+        """
+        import requests
+
+        stop_at = deadline if deadline is not None else getattr(self._local, 'deadline', None)
+
+        session = self._session(urlsplit(url).netloc)
+        request_headers = dict(headers or {})
+
+        cached = None
+        if conditional:
+            with self._lock:
+                cached = self._validated.get(url)
+            if cached is not None:
+                etag, last_modified, _ = cached
+                if etag:
+                    request_headers['If-None-Match'] = etag
+                if last_modified:
+                    request_headers['If-Modified-Since'] = last_modified
+
+        response = last_error = None
+        for attempt in range(self.max_attempts):
+            if attempt:
+                delay = self.backoff_seconds * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                if stop_at is not None and time.monotonic() + delay >= stop_at:
+                    break
+                self._count('retries')
+                time.sleep(delay)
+            request_timeout = timeout
+            if stop_at is not None:
+                request_timeout = min(timeout, stop_at - time.monotonic())
+                if request_timeout <= 0:
+                    break
+            self._count('requests')
+            try:
+                response = session.get(url, timeout=request_timeout, headers=request_headers)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                response, last_error = None, e
+                continue
+            if response.status_code in RETRY_STATUS:
+                continue
+            break
+
+        if response is None:
+            self._count('errors')
+            raise last_error or requests.Timeout(f"deadline exceeded before request: {url}")
+
+        if response.status_code == 304 and cached is not None:
+            self._count('not_modified')
+            with self._lock:
+                if url in self._validated:
+                    self._validated.move_to_end(url)
+            return cached[2]._reused()
+
+        result = HttpResponse(url, response.status_code, response.content,
+                              response.encoding or response.apparent_encoding, response.headers)
+        if conditional and response.status_code == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                with self._lock:
+                    self._validated[url] = (etag, last_modified, result)
+                    self._validated.move_to_end(url)
+                    while len(self._validated) > self.validator_cache_size:
+                        self._validated.popitem(last=False)
+        return result
+
+
+http_client = HttpClient()
@@ -0,0 +1,216 @@
+"""
+저장해 둔 네이버 카페 시세 게시글 일괄 가져오기 (.txt / .html)
+
+RAM 탭에 게시글을 하나씩 붙여넣는 대신, 게시글 파일이 모인 디렉터리를 한 번에 히스토리에 넣습니다.
+파일마다 extract_ram_section -> parse_price_data 를 프로세스 풀에서 나눠 실행하고,
+결과는 save_snapshots 로 한 트랜잭션에 저장합니다 (히스토리 버전은 한 번만 올라감).
+
+    python import_posts.py posts/                       # posts/ 아래 .txt/.html 전부 (하위 폴더 포함)
+    python import_posts.py posts/ --dry-run             # 파싱 결과만 확인, 저장 안 함
+    python import_posts.py posts/ --workers 8 --db price_history.db
+
+날짜/시간대는 아래 순서로 먼저 찾은 것을 씁니다.
+1. 파일 앞부분 메타데이터 줄: "date: 2026-01-30", "slot: 13:00" (time / 날짜 / 시간 도 가능)
+2. HTML <meta content="2026-01-30T13:05:00+09:00"> (article:published_time 등 날짜+시각이 든 meta)
+3. 파일 이름: 2026-01-30_1300.txt, 20260130-13-00.html, 2026-01-30.txt
+
+- 시각은 입력 시간대(10:00 / 13:00 / 18:00) 중 하나로 맞춤 (앱의 시간 미지정 저장과 같은 기준)
+- 시각을 못 찾으면 --default-slot, 날짜를 못 찾거나 RAM 섹션이 없는 파일은 건너뜀
+- 같은 날짜/시간대 파일이 여러 개면 경로 이름순으로 마지막 파일을 사용
+- 저장은 날짜/시간대 스냅샷 단위 교체 (가져오지 않은 다른 시간대는 그대로)
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from price_parser import parse_price_data, extract_ram_section
+from price_store import PriceHistoryStore, PRICE_HISTORY_DB, LEGACY_HISTORY_FILE, TIME_SLOTS, slot_for_hour
+
+POST_EXTENSIONS = (".txt", ".html", ".htm")
+HEADER_LINES = 20  # 메타데이터 줄을 찾는 파일 앞부분 줄 수
+
+_META_DATE = re.compile(r'^\s*(?:date|날짜)\s*[:=]\s*(\d{4})[-./](\d{1,2})[-./](\d{1,2})', re.IGNORECASE)
+_META_TIME = re.compile(r'^\s*(?:slot|time|시간)\s*[:=]\s*(\d{1,2}):(\d{2})', re.IGNORECASE)
+_HTML_META = re.compile(r'<meta\b[^>]*content\s*=\s*["\'](\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2})', re.IGNORECASE)
+# 더 긴 숫자열 안에서는 찾지 않음 (예: "12345678.txt" 의 일부를 날짜로 읽지 않게)
+_FILE_NAME = re.compile(r'(?<!\d)(\d{4})[-_.]?(\d{2})[-_.]?(\d{2})(?:[ _T-]+(\d{2})[-_.:h]?(\d{2}))?(?!\d)')
+
+
+# ==========================================
+# 게시글 1개 (프로세스 풀에서 실행)
+# ==========================================
+def _read_text(path):
+    """UTF-8 (BOM 포함) 우선, 안 되면 CP949 (윈도우에서 저장한 게시글)"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    for encoding in ('utf-8-sig', 'cp949'):
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return raw.decode('utf-8', errors='replace')
+
+
+def _html_to_text(html):
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, 'html.parser').get_text("\n")
+
+
+def _date_key(year, month, day):
+    """'2026-01-30' (달력에 없는 날짜면 None)"""
+    try:
+        return date(int(year), int(month), int(day)).isoformat()
+    except ValueError:
+        return None
+
+
+def _time_slot(hour, minute):
+    """'13:00' 처럼 입력 시간대와 같으면 그대로, 아니면 가장 가까운 시간대 (없는 시각이면 None)"""
+    if int(hour) > 23 or int(minute) > 59:
+        return None
+    label = f"{int(hour):02d}:{int(minute):02d}"
+    return label if label in TIME_SLOTS else slot_for_hour(int(hour))
+
+
+def post_timestamp(path, text):
+    """게시글의 (날짜, 시간대) -> 찾지 못한 값은 None"""
+    date_key = time_slot = None
+    for line in text.splitlines()[:HEADER_LINES]:
+        match = _META_DATE.match(line)
+        if match and date_key is None:
+            date_key = _date_key(*match.groups())
+        match = _META_TIME.match(line)
+        if match and time_slot is None:
+            time_slot = _time_slot(*match.groups())
+
+    if date_key is None or time_slot is None:
+        match = _HTML_META.search(text)
+        if match:
+            year, month, day, hour, minute = match.groups()
+            date_key = date_key or _date_key(year, month, day)
+            time_slot = time_slot or _time_slot(hour, minute)
+
+    if date_key is None or time_slot is None:
+        match = _FILE_NAME.search(os.path.basename(path))
+        if match:
+            year, month, day, hour, minute = match.groups()
+            date_key = date_key or _date_key(year, month, day)
+            if time_slot is None and hour is not None:
+                time_slot = _time_slot(hour, minute)
+    return date_key, time_slot
+
+
+def parse_post(path):
+    """
+    게시글 파일 1개 -> (경로, 날짜, 시간대, 가격 dict, 오류 메시지)
+
+    오류가 있으면 가격 dict 는 None. 프로세스 풀에서 피클로 주고받으므로 모듈 최상위 함수로 둡니다.
+    """
+    try:
+        text = _read_text(path)
+        date_key, time_slot = post_timestamp(path, text)
+        if path.lower().endswith((".html", ".htm")):
+            text = _html_to_text(text)
+        extracted = extract_ram_section(text)
+        if not extracted:
+            return path, date_key, time_slot, None, "RAM 섹션 없음"
+        prices = parse_price_data(extracted)
+        if not prices:
+            return path, date_key, time_slot, None, "파싱 가능한 가격 없음"
+        return path, date_key, time_slot, prices, None
+    except Exception as e:
+        return path, None, None, None, f"{type(e).__name__}: {e}"
+
+
+# ==========================================
+# 디렉터리 전체
+# ==========================================
+def find_posts(directory):
+    """directory 아래 게시글 파일 경로 (이름순)"""
+    paths = []
+    for root, _, names in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in names if name.lower().endswith(POST_EXTENSIONS))
+    return sorted(paths)
+
+
+def parse_posts(paths, workers=None):
+    """게시글들을 프로세스 풀에서 파싱 (workers=1 이면 현재 프로세스에서) -> parse_post 결과 리스트 (경로 순)"""
+    if workers == 1 or len(paths) <= 1:
+        return [parse_post(path) for path in paths]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parse_post, paths, chunksize=chunksize))
+
+
+def collect_snapshots(results, default_slot=None):
+    """
+    parse_post 결과 -> ({(날짜, 시간대): (경로, 가격)}, [(경로, 건너뛴 이유)])
+
+    시간대를 못 찾은 게시글은 default_slot 을 쓰고, 그것도 없으면 건너뜁니다.
+    """
+    snapshots, skipped = {}, []
+    for path, date_key, time_slot, prices, error in results:
+        time_slot = time_slot or default_slot
+        if error:
+            skipped.append((path, error))
+        elif date_key is None:
+            skipped.append((path, "날짜를 찾을 수 없음"))
+        elif time_slot is None:
+            skipped.append((path, "시간대를 찾을 수 없음 (--default-slot 지정)"))
+        else:
+            previous = snapshots.get((date_key, time_slot))
+            if previous is not None:
+                skipped.append((previous[0], f"{date_key} {time_slot} 중복 -> {os.path.basename(path)} 사용"))
+            snapshots[(date_key, time_slot)] = (path, prices)
+    return snapshots, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카페 시세 게시글 일괄 가져오기")
+    parser.add_argument("directory", help="게시글(.txt/.html) 디렉터리")
+    parser.add_argument("--db", default=PRICE_HISTORY_DB, help="히스토리 DB 경로")
+    parser.add_argument("--legacy-json", default=LEGACY_HISTORY_FILE,
+                        help="DB 가 처음 만들어질 때 옮길 예전 price_history.json")
+    parser.add_argument("--workers", type=int, default=None, help="파싱 프로세스 수 (기본: CPU 수, 1 이면 풀 없이)")
+    parser.add_argument("--default-slot", choices=TIME_SLOTS, default=None, help="시각을 못 찾은 게시글의 시간대")
+    parser.add_argument("--dry-run", action="store_true", help="파싱 결과만 출력하고 저장하지 않음")
+    args = parser.parse_args()
+
+    paths = find_posts(args.directory)
+    if not paths:
+        print(f"게시글 파일이 없습니다: {args.directory}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    results = parse_posts(paths, args.workers)
+    parse_seconds = time.perf_counter() - start
+    snapshots, skipped = collect_snapshots(results, args.default_slot)
+
+    for path, reason in skipped:
+        print(f"⚠️ {path}: {reason}")
+    items = sum(len(entries) for _, prices in snapshots.values() for entries in prices.values())
+    print(f"파싱: 파일 {len(paths)}개 -> 스냅샷 {len(snapshots)}개, 제품 {items:,}개 ({parse_seconds:.2f}초)")
+    if snapshots:
+        keys = sorted(snapshots)
+        print(f"기간: {keys[0][0]} {keys[0][1]} ~ {keys[-1][0]} {keys[-1][1]}")
+
+    if args.dry_run or not snapshots:
+        if not snapshots:
+            sys.exit(1)
+        return
+
+    start = time.perf_counter()
+    store = PriceHistoryStore(args.db, legacy_json_path=args.legacy_json)
+    saved = store.save_snapshots(
+        (date_key, time_slot, prices) for (date_key, time_slot), (_, prices) in sorted(snapshots.items())
+    )
+    print(f"저장: 스냅샷 {saved}개 -> {args.db} (버전 {store.version()}, {time.perf_counter() - start:.2f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+지표 카드 HTML (Streamlit 없이 불러올 수 있음)
+
+app.py 는 카드 줄 HTML 을 여기서 만든 뒤 st.markdown 한 번으로 출력하고,
+벤치마크(benchmarks/run_benchmarks.py 의 cards.render)는 같은 함수를 그대로 잽니다.
+
+- view: (종가 표, 티커별 요약 표) -> market_snapshot.compute_snapshot 결과와 함께 만든 튜플
+- 한국 국채 카드는 bond_lookup(naver_code, etf_code) 로 값을 가져옴 (app 은 캐시된 조회 함수를 넘김)
+"""
+import pandas as pd
+
+from sparkline import sparkline_cache
+
+# 국채 금리 소스별 배지 (배경색, 글자색)
+BADGE_COLORS = {
+    "FDR": ("#004d00", "#00ff00"),
+    "BOK": ("#003d5c", "#00bfff"),
+    "Naver": ("#4d3800", "#ffa500"),
+    "ETF대체": ("#4d0000", "#ff6b6b")
+}
+
+
+def card_html(view, name, ticker, period, is_korea_bond=False, etf_code=None, bond_lookup=None, sparklines=None):
+    """지표 카드 1개의 HTML (데이터가 없으면 빈 문자열)"""
+    sparklines = sparkline_cache if sparklines is None else sparklines
+
+    # A. 한국 국채
+    if is_korea_bond:
+        data = bond_lookup(ticker, etf_code) if bond_lookup is not None else None
+        if not data:
+            return f"<div class='metric-card' style='border:1px solid #ff5252'><div class='metric-title'>{name}</div><div class='metric-value' style='color:#ff5252; font-size:16px'>로딩 실패</div></div>"
+
+        val, delta, pct = data['current'], data['delta'], data['delta_pct']
+        src_type = data['source_type']
+
+        # 배지 표시
+        badge_bg, badge_fg = BADGE_COLORS.get(src_type, ("#333", "#ff9800"))
+
+        # ETF 대체일 경우 단위 표시
+        if data.get('is_fallback'):
+            name += f" <span class='fallback-badge' style='background:{badge_bg}; color:{badge_fg};'>{src_type} (가격)</span>"
+        else:
+            name += f" <span class='fallback-badge' style='background:{badge_bg}; color:{badge_fg};'>{src_type}</span>"
+        history = None
+
+    # B. 일반 지표
+    else:
+        close_data, market_snapshot = view
+        if ticker not in market_snapshot.index: return ""
+        row = market_snapshot.loc[ticker]
+        if pd.isna(row['delta_pct']): return ""
+
+        val = float(row['current'])
+        delta = float(row['delta'])
+        pct = float(row['delta_pct'])
+
+        history = close_data[ticker].dropna()
+
+    # C. 공통 렌더링
+    color = '#ff5252' if delta >= 0 else '#00e676'
+    delta_sign = "▲" if delta > 0 else "▼"
+    delta_color = "metric-delta-up" if delta >= 0 else "metric-delta-down"
+
+    # 단위: 금리 소스일 때만 % (ETF 폴백 제외)
+    unit = "%" if (is_korea_bond and not data.get('is_fallback')) or 'TNX' in ticker else ""
+
+    # 차트는 히스토리가 있을 때만 표시 (같은 마지막 봉이면 캐시된 SVG 재사용)
+    chart = sparklines.get(ticker, period, history, color) if history is not None else ""
+
+    return (
+        f"<div class='metric-card'>"
+        f"<div class='metric-title'>{name}</div>"
+        f"<div class='metric-value'>{val:,.2f}{unit}</div>"
+        f"<div class='{delta_color}'>{delta_sign} {abs(delta):.2f} ({pct:.2f}%)</div>"
+        f"{chart}"
+        f"</div>"
+    )
+
+
+def card_row_html(view, cards, period, columns=4, bond_lookup=None, sparklines=None):
+    """카드 여러 개를 한 줄 HTML 로 (cards: [(name, ticker, {옵션}), ...])"""
+    cells = []
+    for card in cards:
+        name, ticker = card[0], card[1]
+        options = card[2] if len(card) > 2 else {}
+        html = card_html(view, name, ticker, period, bond_lookup=bond_lookup, sparklines=sparklines, **options)
+        cells.append(f"<div>{html}</div>")
+    return f"<div class='card-row cols-{columns}'>{''.join(cells)}</div>"
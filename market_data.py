@@ -0,0 +1,162 @@
+"""
+야후 시세 백그라운드 갱신기
+
+st.cache_data(ttl=60) 이 만료된 뒤 처음 들어온 사용자가 yf.download 를 기다리던 방식 대신,
+서버 프로세스 안의 데몬 스레드가 시세를 주기적으로 미리 받아 둡니다.
+페이지는 항상 메모리에 있는 최신 스냅샷만 읽습니다.
+
+간격별로 가장 긴 기간 하나만 받아 두고(일봉 1년 + 30분봉 5일),
+1개월/6개월 같은 짧은 기간은 그 스냅샷을 잘라서 만듭니다. 기간을 바꿔도 네트워크 요청이 없습니다.
+
+실제 다운로드는 OhlcStore 가 담당하며, 저장된 마지막 봉 이후 구간만 받아옵니다.
+disk_cache 를 넘기면 스냅샷을 디스크에도 남겨서, 재시작 직후에는 다운로드를 기다리지 않고
+마지막 스냅샷을 바로 보여준 뒤 갱신 스레드가 새로 받아옵니다.
+"""
+import threading
+import time
+
+from ohlc_store import OhlcStore, PERIOD_DAYS, slice_period
+from run_metrics import run_metrics
+
+# 사이드바 '차트 기간' 옵션에 대응하는 (period, interval) 조합
+PERIOD_INTERVALS = [("5d", "30m"), ("1mo", "1d"), ("6mo", "1d"), ("1y", "1d")]
+
+REFRESH_SECONDS = 60
+
+
+def base_periods(period_intervals):
+    """간격별로 가장 긴 기간 -> {interval: period}"""
+    bases = {}
+    for period, interval in period_intervals:
+        current = bases.get(interval)
+        if current is None or PERIOD_DAYS.get(period, 0) > PERIOD_DAYS.get(current, 0):
+            bases[interval] = period
+    return bases
+
+
+class MarketDataRefresher:
+    """간격별 기준 스냅샷을 유지하는 데몬 스레드 (짧은 기간은 잘라서 제공)"""
+
+    def __init__(self, ticker_list, period_intervals=PERIOD_INTERVALS, refresh_seconds=REFRESH_SECONDS,
+                 fetch=None, disk_cache=None):
+        self.ticker_list = list(ticker_list)
+        self.base_periods = base_periods(period_intervals)
+        self.refresh_seconds = refresh_seconds
+        self._fetch = fetch if fetch is not None else OhlcStore().fetch
+        self._disk_cache = disk_cache
+        self._lock = threading.Lock()
+        self._snapshots = {}  # interval -> (기준 기간 frame, fetched_at)
+        self._views = {}      # (period, interval) -> (fetched_at, 잘라낸 frame)
+        self._interval_locks = {interval: threading.Lock() for interval in self.base_periods}
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """갱신 스레드 시작 (이미 돌고 있으면 무시)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="market-data-refresher", daemon=True)
+            self._thread.start()
+
+    def refresh_now(self, period, interval):
+        """해당 간격의 기준 스냅샷을 지금 바로 다시 받아옴 -> (frame, fetched_at)"""
+        self._refresh(interval)
+        return self.get(period, interval)
+
+    def request_refresh(self):
+        """다음 주기를 기다리지 않고 바로 갱신"""
+        self._wake.set()
+
+    def get(self, period, interval):
+        """
+        (frame, fetched_at) 반환
+
+        아직 한 번도 받지 못한 간격이면(서버 시작 직후) 이 호출에서 한 번만 직접 받아옵니다.
+        """
+        snapshot = self._base_snapshot(interval)
+        frame, fetched_at = snapshot
+        if frame is None or period == self.base_periods.get(interval):
+            return snapshot
+
+        key = (period, interval)
+        with self._lock:
+            view = self._views.get(key)
+        if view is None or view[0] != fetched_at:
+            view = (fetched_at, slice_period(frame, period))
+            with self._lock:
+                self._views[key] = view
+        return view[1], fetched_at
+
+    def age_seconds(self, period, interval):
+        """스냅샷이 만들어진 뒤 지난 시간 (없으면 None)"""
+        with self._lock:
+            snapshot = self._snapshots.get(interval)
+        if snapshot is None:
+            return None
+        return time.time() - snapshot[1]
+
+    def _base_snapshot(self, interval):
+        with self._lock:
+            snapshot = self._snapshots.get(interval)
+        if snapshot is not None:
+            return snapshot
+
+        # 동시에 들어온 첫 요청들은 다운로드 한 번을 같이 기다림
+        with self._interval_lock(interval):
+            with self._lock:
+                snapshot = self._snapshots.get(interval)
+            if snapshot is not None:
+                return snapshot
+            snapshot = self._load_persisted(interval)
+            if snapshot is not None:
+                # 오래된 값이라도 먼저 보여주고 갱신은 스레드에 맡김
+                run_metrics.mark("stale")
+                self.request_refresh()
+                return snapshot
+            run_metrics.mark()
+            return self._refresh(interval)
+
+    def _cache_key(self, interval):
+        return f"market:{interval}:{self.base_periods[interval]}:{','.join(sorted(self.ticker_list))}"
+
+    def _load_persisted(self, interval):
+        """디스크에 남은 마지막 스냅샷 (티커 목록/기간이 같을 때만)"""
+        if self._disk_cache is None or interval not in self.base_periods:
+            return None
+        entry = self._disk_cache.get(self._cache_key(interval))
+        if entry is None:
+            return None
+        snapshot = (entry.value, entry.stored_at)
+        with self._lock:
+            return self._snapshots.setdefault(interval, snapshot)
+
+    def _interval_lock(self, interval):
+        with self._lock:
+            return self._interval_locks.setdefault(interval, threading.Lock())
+
+    def _refresh(self, interval):
+        period = self.base_periods.get(interval)
+        if period is None:
+            return None, None
+        frame = self._fetch(self.ticker_list, period, interval)
+        with self._lock:
+            if frame is None:
+                # 실패하면 이전 스냅샷 유지
+                return self._snapshots.get(interval, (None, None))
+            snapshot = (frame, time.time())
+            self._snapshots[interval] = snapshot
+        if self._disk_cache is not None:
+            self._disk_cache.set(self._cache_key(interval), frame, self.refresh_seconds)
+        return snapshot
+
+    def _run(self):
+        while True:
+            for interval in self.base_periods:
+                try:
+                    self._refresh(interval)
+                except Exception as e:
+                    # 예상 못한 오류로 스레드가 끝나면 프로세스를 다시 띄울 때까지 갱신이 멈추므로 기록만 하고 계속
+                    print(f"Error refreshing market data ({interval}): {e}")
+            self._wake.wait(self.refresh_seconds)
+            self._wake.clear()
@@ -0,0 +1,68 @@
+"""
+티커별 시세 요약 표 (현재가, 전일가, 변동, 변동률, 최저, 최고)
+
+카드마다 raw_data[ticker]['Close'] 를 꺼내 dropna 후 따로 계산하던 것을
+yf.download(group_by='ticker') 결과 전체에 대해 한 번에 계산합니다.
+"""
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_COLUMNS = ["current", "prev", "delta", "delta_pct", "min", "max"]
+
+
+def close_prices(frame):
+    """yf.download(group_by='ticker') 결과 -> 종가 표 (행: 시각, 열: 티커). 없으면 None"""
+    if frame is None or frame.empty:
+        return None
+    if isinstance(frame.columns, pd.MultiIndex):
+        if "Close" not in frame.columns.get_level_values(1):
+            return None
+        closes = frame.xs("Close", axis=1, level=1)
+    elif "Close" in frame.columns:
+        closes = frame[["Close"]]
+    else:
+        return None
+    return closes.astype(float)
+
+
+def _last_valid(values, valid):
+    """열마다 마지막 유효 값과 그 행 번호 (유효 값이 없으면 NaN, -1)"""
+    rows = len(values) - 1 - np.argmax(valid[::-1], axis=0)
+    has_value = valid.any(axis=0)
+    rows = np.where(has_value, rows, -1)
+    cols = np.arange(values.shape[1])
+    return np.where(has_value, values[rows, cols], np.nan), rows
+
+
+def compute_snapshot(closes):
+    """
+    종가 표 -> 티커별 요약 표 (index: 티커, columns: SNAPSHOT_COLUMNS)
+
+    결측치는 건너뛰고 티커마다 마지막 두 유효 값으로 변동을 계산합니다.
+    유효 값이 2개 미만인 티커는 prev 이후 값이 NaN 입니다.
+    """
+    if closes is None or closes.empty:
+        return pd.DataFrame(columns=SNAPSHOT_COLUMNS, dtype=float)
+
+    values = closes.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+
+    current, last_rows = _last_valid(values, valid)
+    cols = np.arange(values.shape[1])
+    earlier = valid.copy()
+    has_last = last_rows >= 0
+    earlier[last_rows[has_last], cols[has_last]] = False
+    prev, _ = _last_valid(values, earlier)
+
+    delta = current - prev
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta_pct = np.where(prev != 0, delta / prev * 100, np.nan)
+
+    return pd.DataFrame({
+        "current": current,
+        "prev": prev,
+        "delta": delta,
+        "delta_pct": delta_pct,
+        "min": closes.min().to_numpy(dtype=float),
+        "max": closes.max().to_numpy(dtype=float),
+    }, index=closes.columns)
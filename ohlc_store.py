@@ -0,0 +1,206 @@
+"""
+티커/간격별 OHLC 로컬 저장소 (증분 다운로드)
+
+매 갱신마다 기간 전체를 다시 받던 방식 대신, 티커마다 마지막 봉 시각을 기억해 두고
+그 이후 구간만 한 번의 배치 요청으로 받아 기존 데이터에 합칩니다.
+저장 형식은 pandas pickle (.pkl) 이며 원자적으로 교체합니다.
+record/replay 모드에서는 저장소를 쓰지 않고 매번 기간 전체를 받습니다 (source_replay.py 참고).
+"""
+import os
+import re
+import tempfile
+import threading
+from datetime import timedelta
+
+import pandas as pd
+
+from source_replay import source_replay
+
+OHLC_CACHE_DIR = source_replay.cache_dir("ohlc")
+
+# 기간별로 최소한 이만큼(달력 기준 일수) 과거 데이터가 있어야 증분 갱신 가능
+PERIOD_DAYS = {"5d": 7, "1mo": 31, "6mo": 183, "1y": 366}
+# 간격별 보관 기간 (야후 분봉은 최근 60일까지만 제공)
+RETENTION_DAYS = {"30m": 59, "1d": 400}
+# 기간 시작일 비교 시 휴장일 허용 오차
+COVERAGE_SLACK_DAYS = 5
+
+
+def _yf_download(tickers, **kwargs):
+    def download():
+        import yfinance as yf  # 첫 다운로드 때 불러옴 (갱신 스레드에서)
+        return yf.download(tickers, group_by='ticker', threads=True, progress=False, **kwargs)
+
+    # 증분 요청의 시작일은 키에서 뺌 (녹화한 날과 다른 날 재생해도 같은 fixture)
+    span = kwargs.get('period', 'incremental')
+    key = f"yahoo:{kwargs.get('interval')}:{span}:{','.join(sorted(tickers))}"
+    return source_replay.call("yahoo", key, download)
+
+
+def _split_by_ticker(frame, tickers):
+    """yf.download 결과 -> {ticker: OHLC DataFrame}"""
+    if frame is None or frame.empty:
+        return {}
+    result = {}
+    if isinstance(frame.columns, pd.MultiIndex):
+        available = set(frame.columns.get_level_values(0))
+        for ticker in tickers:
+            if ticker in available:
+                sub = frame[ticker].dropna(how='all')
+                if not sub.empty:
+                    result[ticker] = sub
+    elif len(tickers) == 1:
+        sub = frame.dropna(how='all')
+        if not sub.empty:
+            result[tickers[0]] = sub
+    return result
+
+
+def _now_like(index):
+    """인덱스와 같은 시간대의 현재 시각"""
+    tz = getattr(index, 'tz', None)
+    return pd.Timestamp.now(tz=tz) if tz is not None else pd.Timestamp.now()
+
+
+def _naive(ts):
+    """시간대가 서로 다른 티커끼리 비교할 수 있도록 UTC 기준 naive 시각으로"""
+    return ts.tz_convert(None) if ts.tzinfo is not None else ts
+
+
+def slice_period(frame, period):
+    """
+    저장된 데이터에서 기간만큼 잘라냄
+
+    'Nd' 는 야후와 같이 최근 N 거래일, 나머지는 달력 기준입니다.
+    """
+    if frame is None or frame.empty:
+        return frame
+    if period.endswith("d"):
+        days = int(period[:-1])
+        dates = frame.index.normalize()
+        unique_dates = dates.unique()
+        if len(unique_dates) <= days:
+            return frame
+        return frame[dates >= unique_dates[-days]]
+    if period.endswith("mo"):
+        offset = pd.DateOffset(months=int(period[:-2]))
+    elif period.endswith("y"):
+        offset = pd.DateOffset(years=int(period[:-1]))
+    else:
+        return frame
+    return frame[frame.index >= _now_like(frame.index) - offset]
+
+
+class OhlcStore:
+    """티커/간격별 OHLC 를 디스크 + 메모리에 보관 (incremental=False 면 보관하지 않고 매번 기간 전체)"""
+
+    def __init__(self, cache_dir=OHLC_CACHE_DIR, download=_yf_download, incremental=None):
+        self.cache_dir = cache_dir
+        self._download = download
+        self.incremental = source_replay.persistent if incremental is None else incremental
+        self._lock = threading.Lock()
+        self._frames = {}  # (ticker, interval) -> DataFrame
+
+    # ------------------------------------------
+    # 디스크 입출력
+    # ------------------------------------------
+    def _path(self, ticker, interval):
+        safe = re.sub(r'[^0-9A-Za-z._-]', '_', ticker)
+        return os.path.join(self.cache_dir, f"{safe}__{interval}.pkl")
+
+    def _load(self, ticker, interval):
+        key = (ticker, interval)
+        if key in self._frames:
+            return self._frames[key]
+        frame = None
+        path = self._path(ticker, interval)
+        if os.path.exists(path):
+            try:
+                frame = pd.read_pickle(path)
+            except Exception as e:
+                print(f"Error loading OHLC cache {path}: {e}")
+        self._frames[key] = frame
+        return frame
+
+    def _save(self, ticker, interval, frame):
+        self._frames[(ticker, interval)] = frame
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            frame.to_pickle(tmp_path)
+            os.replace(tmp_path, self._path(ticker, interval))
+        except Exception as e:
+            print(f"Error saving OHLC cache for {ticker}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # ------------------------------------------
+    # 갱신
+    # ------------------------------------------
+    def _covers(self, frame, period, interval):
+        """저장된 데이터로 기간 전체를 채울 수 있고, 마지막 봉 이후 구간을 받아올 수 있는지"""
+        if frame is None or frame.empty:
+            return False
+        now = _now_like(frame.index)
+        need_days = PERIOD_DAYS.get(period, RETENTION_DAYS.get(interval, 400))
+        if frame.index[0] > now - pd.Timedelta(days=need_days - COVERAGE_SLACK_DAYS):
+            return False
+        # 분봉은 마지막 봉이 너무 오래되면 이어 받을 수 없음
+        retention = RETENTION_DAYS.get(interval)
+        if retention and frame.index[-1] < now - pd.Timedelta(days=retention):
+            return False
+        return True
+
+    def _merge(self, old, new, interval):
+        if old is None or old.empty:
+            merged = new
+        else:
+            merged = pd.concat([old, new])
+            merged = merged[~merged.index.duplicated(keep='last')]
+        merged = merged.sort_index()
+        retention = RETENTION_DAYS.get(interval)
+        if retention:
+            merged = merged[merged.index >= _now_like(merged.index) - pd.Timedelta(days=retention)]
+        return merged
+
+    def fetch(self, ticker_list, period, interval):
+        """
+        period 기간의 데이터를 yf.download(group_by='ticker') 와 같은 형태로 반환 (실패 시 None)
+
+        저장된 데이터가 있는 티커는 마지막 봉 이후만, 없는 티커만 기간 전체를 받습니다.
+        """
+        tickers = list(ticker_list)
+        with self._lock:
+            if self.incremental:
+                stored = {t: self._load(t, interval) for t in tickers}
+            else:
+                stored = dict.fromkeys(tickers)
+            full = [t for t in tickers if not self._covers(stored[t], period, interval)]
+            tail = [t for t in tickers if t not in full]
+
+            downloads = []
+            if full:
+                downloads.append((full, dict(period=period, interval=interval)))
+            if tail:
+                # 마지막 봉(진행 중일 수 있음)도 다시 받도록 하루 겹쳐서 요청
+                last = min(_naive(stored[t].index[-1]) for t in tail)
+                start = (last - timedelta(days=1)).strftime('%Y-%m-%d')
+                downloads.append((tail, dict(start=start, interval=interval)))
+
+            for group, kwargs in downloads:
+                try:
+                    fetched = _split_by_ticker(self._download(group, **kwargs), group)
+                except Exception as e:
+                    print(f"Error downloading OHLC ({interval}, {kwargs}): {e}")
+                    continue
+                for ticker, new in fetched.items():
+                    merged = self._merge(stored[ticker], new, interval)
+                    stored[ticker] = merged
+                    if self.incremental:
+                        self._save(ticker, interval, merged)
+
+        parts = {t: slice_period(f, period) for t, f in stored.items() if f is not None and not f.empty}
+        if not parts:
+            return None
+        return pd.concat(parts, axis=1)
@@ -0,0 +1,349 @@
+"""
+네이버 카페 시세 게시글 파서
+
+줄마다 정규식 8개를 순서대로 돌려보던 방식 대신, 미리 컴파일된 규칙 테이블을 사용합니다.
+각 규칙은 키워드 사전 필터(D5, PC4, PC3, TX, 칩, TB ...)를 먼저 확인하고,
+키워드가 있는 규칙만 정규식을 실행합니다. 규칙 순서는 기존 패턴 1~8 순서와 같습니다.
+가격('원')이 없는 줄은 정규식을 하나도 실행하지 않습니다.
+
+extract_sections 는 게시글 전체에서 RAM/SSD/CPU/GPU 섹션을 한 번에 잘라냅니다.
+"""
+import re
+from collections import namedtuple
+
+# ==========================================
+# 공통 헬퍼
+# ==========================================
+def _parse_price(price_str):
+    """'110,000' / '170.000' -> 110000 (숫자가 없으면 None)"""
+    try:
+        return int(price_str.replace(',', '').replace('.', ''))
+    except ValueError:
+        return None
+
+def format_price(price):
+    """110000 -> '110,000원' (화면 표시용)"""
+    return f"{price:,}원"
+
+def _add_price(prices, category, product_name, price):
+    prices.setdefault(category, []).append({
+        'product': product_name,
+        'price': price,
+        'price_formatted': format_price(price)
+    })
+
+def _ram_product(ddr_type, capacity, speed, ram_type):
+    """DDR 세대/데스크탑·노트북 구분에 따른 (카테고리, 제품명)"""
+    if ddr_type == 'DDR5':
+        product_name = f"삼성 DDR5 {capacity} {speed}MHz"
+    else:
+        prefix = 'PC4' if ddr_type == 'DDR4' else 'PC3'
+        product_name = f"삼성 {ddr_type} {capacity} {prefix}-{speed}"
+
+    if ram_type == 'laptop':
+        return f"{ddr_type} RAM (노트북)", f"{product_name} (노트북)"
+    return f"{ddr_type} RAM (데스크탑)", product_name
+
+# ==========================================
+# 규칙 테이블
+# ==========================================
+# required: 모두 포함되어야 함 / any_of: 하나 이상 포함되어야 함 (대문자로 변환한 파트 기준)
+# build(match, ram_type, base_info) -> (카테고리, 제품명, 가격 문자열) 또는 None
+ParseRule = namedtuple('ParseRule', ['name', 'required', 'any_of', 'pattern', 'build', 'needs_base', 'line_keyword'])
+
+def _build_ddr5(m, ram_type, base_info):
+    category, product_name = _ram_product('DDR5', m.group(1), m.group(2), ram_type)
+    return category, product_name, m.group(3)
+
+def _build_ddr4(m, ram_type, base_info):
+    category, product_name = _ram_product('DDR4', m.group(1), m.group(2), ram_type)
+    return category, product_name, m.group(3)
+
+def _build_ddr_continuation(m, ram_type, base_info):
+    category, product_name = _ram_product(
+        base_info.get('ddr_type', ''), base_info.get('capacity', ''), m.group(1), base_info.get('ram_type')
+    )
+    return category, product_name, m.group(2)
+
+def _build_ddr3(m, ram_type, base_info):
+    category, product_name = _ram_product('DDR3', m.group(1), m.group(2), ram_type)
+    return category, product_name, m.group(3)
+
+def _build_cpu(m, ram_type, base_info):
+    cpu_name = m.group(1).strip()
+    # Intel vs AMD 구분
+    category = "Intel CPU" if cpu_name.lower().startswith('i') else "AMD CPU"
+    return category, cpu_name, m.group(2)
+
+def _build_gpu(m, ram_type, base_info):
+    return "그래픽카드", f"{m.group(1)} {m.group(2).strip()}", m.group(3)
+
+def _build_mainboard(m, ram_type, base_info):
+    return "메인보드", f"{m.group(1)} 칩셋", m.group(2)
+
+def _build_ssd(m, ram_type, base_info):
+    capacity = m.group(1).split(',')[0].split('/')[0]
+    return "SSD", f"삼성 SSD {capacity}", m.group(2)
+
+def _build_hdd(m, ram_type, base_info):
+    return "HDD", f"{m.group(1)}TB HDD", m.group(3)
+
+PARSE_RULES = (
+    # 패턴 1: DDR5 형식 - "삼성 D5 8G- 5600 [44800] - 110,000원"
+    ParseRule('ddr5', ('삼성', 'D5'), (),
+              re.compile(r'삼성\s*D5\s*(\d+G)[^\d]*([\d]+)\s*[\[\(]?[\d,\.]*[\]\)]?\s*-\s*([\d,\.]+)\s*원', re.IGNORECASE),
+              _build_ddr5, False, None),
+    # 패턴 2: DDR4 형식 - "삼성 32G PC4 25600 [3200mhz] - 235.000원"
+    ParseRule('ddr4', ('삼성', 'PC4'), (),
+              re.compile(r'삼성\s*(\d+G)\s*PC4\s*([\d]+)\s*[\[\(]?[\d,\.]*[Mm]?[Hh]?[Zz]?[\]\)]?\s*-\s*([\d,\.]+)\s*원', re.IGNORECASE),
+              _build_ddr4, False, None),
+    # 패턴 2-1: DDR4/DDR5 추가 속도 (쉼표 뒤) - "19200[2400mhz] - 100.000원"
+    ParseRule('ddr_continuation', (), (),
+              re.compile(r'([\d]+)\s*[\[\(]?[\d,\.]*[Mm]?[Hh]?[Zz]?[\]\)]?\s*-\s*([\d,\.]+)\s*원'),
+              _build_ddr_continuation, True, None),
+    # 패턴 3: DDR3 형식 - "삼성 8G PC3 12800 - 3,000원"
+    ParseRule('ddr3', ('삼성', 'PC3'), (),
+              re.compile(r'삼성\s*(\d+G)\s*PC3\s*([\d]+)\s*-\s*([\d,\.]+)\s*원', re.IGNORECASE),
+              _build_ddr3, False, None),
+    # 패턴 4: CPU 형식 - "8-12.i9 10900KF - 170.000원"
+    ParseRule('cpu', (), ('I3', 'I5', 'I7', 'I9', 'R3', 'R5', 'R7', 'R9'),
+              re.compile(r'[\d\-\.]+\s*([iR][3579]\s*[\-\s]?[\d]+[A-Z]*[A-Z]?)\s*-\s*([\d,\.]+)\s*원', re.IGNORECASE),
+              _build_cpu, False, None),
+    # 패턴 5: 그래픽카드 - "RTX 2060 - 120.000원"
+    ParseRule('gpu', (), ('TX', 'RX'),
+              re.compile(r'([GR]TX|RX)\s*([\d]+\s*[A-Z]*)\s*-\s*([\d,\.]+)\s*원', re.IGNORECASE),
+              _build_gpu, False, None),
+    # 패턴 6: 메인보드 - "B660 칩셋 45.000원"
+    ParseRule('mainboard', ('칩',), (),
+              re.compile(r'([HBZAX][\d]+)\s*칩[셋]?\s*-?\s*([\d,\.]+)\s*원', re.IGNORECASE),
+              _build_mainboard, False, None),
+    # 패턴 7: SSD - "삼성 500G,512G - 40.000원" (원본 줄에 SSD 표기가 있을 때만)
+    ParseRule('ssd', ('삼성',), (),
+              re.compile(r'삼성\s*([\d]+G[,/]?[\d]*G?)\s*-\s*([\d,\.]+)\s*원', re.IGNORECASE),
+              _build_ssd, False, 'SSD'),
+    # 패턴 8: HDD - "1테라,1TB - 6.000원"
+    ParseRule('hdd', ('TB',), (),
+              re.compile(r'([\d]+)\s*[테테라]*[,/]?([\d]*)\s*TB\s*-\s*([\d,\.]+)\s*원', re.IGNORECASE),
+              _build_hdd, False, None),
+)
+
+_CAPACITY_RE = re.compile(r'(\d+G)')
+
+# ==========================================
+# 게시글 섹션 추출
+# ==========================================
+# 섹션: 시작 마커 중 가장 앞선 위치 ~ 그 이후 종료 마커 중 가장 앞선 위치
+SECTION_MARKERS = {
+    'RAM': {
+        'start': [
+            "RAM 메모리(삼성기준)",
+            "RAM 메모리",
+            "16-1.데스크탑용 DDR5",
+            "13.데스크탑 DDR3",
+            "14.데스크탑 DDR4",
+            "15.노트북용 DDR3",
+            "16.노트북용 DDR4",
+        ],
+        'end': [
+            "17.SSD",
+            "20-3. 삼성 M.2",
+            "0-1.삼성 120G,128G",
+            "[모든 데이터는 포맷",
+            "SSD 삼성 정품 기준",
+        ],
+        'min_length': 100,
+    },
+    'SSD': {
+        'start': ["SSD 삼성 정품 기준", "17.SSD", "0-1.삼성 120G,128G", "20-3. 삼성 M.2"],
+        'end': ["HDD", "하드디스크"],
+        'min_length': 20,
+    },
+    'CPU': {
+        'start': ["CPU 시세", "인텔 CPU", "AMD CPU"],
+        'end': ["그래픽카드", "VGA", "RAM 메모리", "13.데스크탑 DDR3"],
+        'min_length': 20,
+    },
+    'GPU': {
+        'start': ["그래픽카드", "VGA"],
+        'end': ["메인보드", "RAM 메모리", "13.데스크탑 DDR3", "17.SSD"],
+        'min_length': 20,
+    },
+}
+
+def _without_extended_markers(markers):
+    """다른 마커로 시작하는 마커는 제외 (짧은 마커의 위치가 항상 같거나 더 앞섬)"""
+    return [m for m in markers if not any(o != m and m.startswith(o) for o in markers)]
+
+class _MarkerScanner:
+    """
+    게시글 하나에 대한 마커 위치 테이블
+
+    마커별로 이미 훑은 구간과 결과를 기억해 두고 여러 섹션이 공유합니다.
+    (순수 파이썬 멀티패턴 오토마톤이나 정규식 alternation 한 번보다
+    마커별 str.find 가 CPython 에서 훨씬 빠르므로 스캔 자체는 str.find 를 사용)
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self._scanned = {}  # marker -> (구간 시작, 구간 끝, 첫 위치 또는 -1)
+
+    def first(self, marker, from_pos=0, limit=None):
+        """from_pos 이후 limit 이전에 시작하는 첫 위치 (없으면 -1)"""
+        end = len(self.text) if limit is None else min(len(self.text), limit + len(marker) - 1)
+
+        cached = self._scanned.get(marker)
+        if cached and cached[0] <= from_pos:
+            lo, hi, pos = cached
+            if pos >= from_pos:
+                return pos if limit is None or pos < limit else -1
+            if pos == -1 and hi >= end:
+                return -1
+
+        pos = self.text.find(marker, from_pos, end)
+        self._scanned[marker] = (from_pos, end, pos)
+        return pos
+
+    def earliest(self, markers, from_pos=0, default=-1):
+        """마커들 중 from_pos 이후 가장 앞선 위치 (찾은 위치보다 뒤는 더 보지 않음)"""
+        best = default
+        for marker in _without_extended_markers(markers):
+            pos = self.first(marker, from_pos, None if best == -1 else best)
+            if pos != -1 and (best == -1 or pos < best):
+                best = pos
+        return best
+
+def extract_sections(full_text, sections=('RAM', 'SSD', 'CPU', 'GPU')):
+    """게시글에서 여러 섹션을 한 번에 추출 -> {섹션명: 텍스트} (찾지 못한 섹션은 제외)"""
+    scanner = _MarkerScanner(full_text)
+    result = {}
+
+    for name in sections:
+        spec = SECTION_MARKERS[name]
+
+        start_pos = scanner.earliest(spec['start'])
+        if start_pos == -1:
+            continue
+
+        end_pos = scanner.earliest(spec['end'], start_pos, default=len(full_text))
+        extracted = full_text[start_pos:end_pos].strip()
+
+        # 최소 길이 체크 (너무 짧으면 잘못된 추출)
+        if len(extracted) < spec.get('min_length', 0):
+            continue
+        result[name] = extracted
+
+    return result
+
+def extract_ram_section(full_text):
+    """
+    네이버 카페 게시글에서 RAM 관련 섹션만 추출
+    시작: "RAM 메모리(삼성기준)"
+    종료: "17.SSD 삼성 정품 기준" 또는 "SSD" 섹션 시작
+    """
+    return extract_sections(full_text, ('RAM',)).get('RAM')
+
+# ==========================================
+# 파싱
+# ==========================================
+def parse_price_data(price_text):
+    """
+    텍스트에서 CPU/RAM 가격 정보를 파싱합니다.
+    다양한 형식 지원:
+    - "8-12.i9 10900KF - 170.000원"
+    - "삼성 D5 8G- 5600 [44800] - 110,000원"
+    - "삼성 32G PC4 25600 [3200mhz] - 235.000원"
+    - "14-2.삼성 16G PC4 21300[2666mhz] - 105,000원 , 19200[2400mhz] - 100.000원"
+    데스크탑/노트북 구분 지원
+    """
+    prices = {}
+    current_ram_type = None  # 'desktop' or 'laptop'
+
+    for line in price_text.split('\n'):
+        stripped = line.strip()
+        # 빈 줄이나 주석 건너뛰기
+        if not stripped or stripped[0] in '*(':
+            continue
+
+        # 데스크탑/노트북 섹션 감지
+        if '데스크탑용' in line or '데스크탑 DDR' in line:
+            current_ram_type = 'desktop'
+            continue
+        elif '노트북용' in line or '노트북 DDR' in line:
+            current_ram_type = 'laptop'
+            continue
+
+        # 모든 규칙이 '원'으로 끝나므로 가격이 없는 줄은 바로 건너뜀
+        if '원' not in line:
+            continue
+
+        # 여러 제품이 한 줄에 있는 경우 처리 (쉼표로 구분)
+        if ' , ' in line:
+            parts = line.split(' , ')
+
+            # 첫 번째 파트에서 기본 정보 추출
+            base_info = extract_base_info(parts[0])
+            base_info['ram_type'] = current_ram_type  # 데스크탑/노트북 정보 추가
+
+            parse_single_line(parts[0], line, prices, None, current_ram_type)
+            for part in parts[1:]:
+                # 이후 파트는 기본 정보를 상속
+                parse_single_line(part, line, prices, base_info, current_ram_type)
+        else:
+            parse_single_line(line, line, prices, None, current_ram_type)
+
+    return prices
+
+def extract_base_info(first_part):
+    """첫 번째 파트에서 브랜드, 용량, 타입 등 기본 정보 추출"""
+    info = {}
+
+    # 삼성 체크
+    if '삼성' in first_part:
+        info['brand'] = '삼성'
+
+    # DDR 타입 체크
+    if 'D5' in first_part or 'DDR5' in first_part:
+        info['ddr_type'] = 'DDR5'
+    elif 'PC4' in first_part or 'DDR4' in first_part:
+        info['ddr_type'] = 'DDR4'
+    elif 'PC3' in first_part or 'DDR3' in first_part:
+        info['ddr_type'] = 'DDR3'
+
+    # 용량 체크
+    capacity_match = _CAPACITY_RE.search(first_part)
+    if capacity_match:
+        info['capacity'] = capacity_match.group(1)
+
+    return info
+
+def parse_single_line(part, original_line, prices, base_info=None, ram_type=None):
+    """단일 제품 라인 파싱 (규칙 테이블 순서대로 첫 번째 매칭 사용)"""
+    if '원' not in part:
+        return
+
+    has_ddr_base = bool(base_info) and base_info.get('ddr_type') in ('DDR4', 'DDR5')
+    # 키워드 검사는 규칙 직전에 부분 문자열로만 수행 (정규식 1회보다 훨씬 저렴)
+    contains = part.upper().__contains__
+
+    for _, required, any_of, pattern, build, needs_base, line_keyword in PARSE_RULES:
+        if needs_base and not has_ddr_base:
+            continue
+        if not all(map(contains, required)):
+            continue
+        if any_of and not any(map(contains, any_of)):
+            continue
+
+        match = pattern.search(part)
+        if match is None:
+            continue
+        if line_keyword and line_keyword not in original_line:
+            continue
+
+        category, product_name, price_str = build(match, ram_type, base_info)
+        price = _parse_price(price_str)
+        if price is None:
+            # 가격 숫자가 없으면 다음 규칙 시도 (기존 동작 유지)
+            continue
+
+        _add_price(prices, category, product_name, price)
+        return
@@ -0,0 +1,560 @@
+"""
+RAM 가격 히스토리 저장소 (SQLite)
+
+price_history.json 전체를 매번 다시 쓰던 방식 대신,
+(날짜, 시간대, 카테고리, 제품) 인덱스가 걸린 SQLite 테이블에 행 단위로 저장합니다.
+스냅샷 1건 저장 / 날짜 1개 삭제 비용은 전체 히스토리 크기와 무관합니다.
+
+모든 행은 (날짜, 시간대, 카테고리, 제품, 가격) 한 가지 형태입니다 (HistoryRow).
+구 형식(시간대 없이 날짜만) 데이터는 저장할 때 DAILY_SLOT 시간대로 옮기므로,
+읽는 쪽은 날짜마다 형식을 확인하지 않습니다.
+구/신 형식 dict 를 구분하는 곳은 외부 입력 경계(normalize_history: 구 JSON 파일, 예전 백업) 한 곳뿐입니다.
+
+쓰기마다 meta.version 이 1씩 증가하며, 메모리용 열 단위 히스토리(PriceHistoryTable)는
+이 버전 기준으로 한 번만 만들어지고 같은 프로세스의 저장/삭제 시 즉시 갱신됩니다.
+이를 위해 제품/카테고리 이름 사전(products, categories)과 스냅샷별 id/가격 배열(snapshot_columns)을
+같은 DB 에 함께 둡니다. 쓰기는 바뀐 스냅샷의 배열만 지우고, 다음에 표를 만들 때 빠진 것만 다시 채웁니다.
+표시용 price_formatted 는 저장하지 않습니다 (구 데이터에 남아 있는 값은 무시).
+
+date_changes 테이블에는 날짜별로 마지막으로 바뀐 버전을 남겨서(삭제 포함)
+마지막 백업 이후 바뀐 날짜만 골라 증분 백업할 수 있게 합니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+
+from history_table import PriceHistoryTable, NameDictionary, encode_snapshot
+from price_parser import format_price
+from run_metrics import run_metrics
+
+PRICE_HISTORY_DB = "price_history.db"
+LEGACY_HISTORY_FILE = "price_history.json"
+
+DAILY_SLOT = "00:00"    # 시간대 없이 날짜만 있던 데이터가 옮겨지는 시간대
+TIME_SLOTS = ("10:00", "13:00", "18:00")  # 시세 게시글 입력 시간대
+
+INDEX_OVERLAY_LIMIT = 256  # 메모리 표에 덧붙인 스냅샷이 이보다 많아지면 다음 조회 때 BLOB 에서 다시 만듦
+
+HistoryRow = namedtuple("HistoryRow", ["date", "slot", "category", "product", "price"])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS price_history (
+    date TEXT NOT NULL,
+    time_slot TEXT NOT NULL,
+    category TEXT NOT NULL,
+    product TEXT NOT NULL,
+    price INTEGER NOT NULL,
+    price_formatted TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_price_history_key
+    ON price_history (date, time_slot, category, product);
+CREATE INDEX IF NOT EXISTS idx_price_history_product
+    ON price_history (product, date, time_slot);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS date_changes (
+    date TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS snapshot_columns (
+    date TEXT NOT NULL,
+    time_slot TEXT NOT NULL,
+    category_ids BLOB NOT NULL,
+    product_ids BLOB NOT NULL,
+    prices BLOB NOT NULL,
+    price_width INTEGER NOT NULL,
+    PRIMARY KEY (date, time_slot)
+);
+"""
+
+
+class PriceHistoryStore:
+    """날짜/시간대 단위로 스냅샷을 읽고 쓰는 히스토리 저장소"""
+
+    def __init__(self, db_path=PRICE_HISTORY_DB, legacy_json_path=LEGACY_HISTORY_FILE):
+        self.db_path = db_path
+        self.legacy_json_path = legacy_json_path
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._index_lock = threading.Lock()
+        self._index = None
+        self._index_version = None
+
+    # ------------------------------------------
+    # 연결 / 초기화
+    # ------------------------------------------
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    self._migrate_legacy_json(conn)
+                    self._initialized = True
+        return conn
+
+    def _migrate_legacy_json(self, conn):
+        """기존 price_history.json 이 있으면 최초 1회만 DB로 옮김"""
+        done = conn.execute("SELECT value FROM meta WHERE key = 'legacy_json_migrated'").fetchone()
+        if done or not self.legacy_json_path or not os.path.exists(self.legacy_json_path):
+            return
+
+        try:
+            with open(self.legacy_json_path, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+            history = json.loads(content) if content else {}
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Error migrating legacy price history: {e}")
+            history = {}
+
+        with conn:
+            conn.executemany(
+                "INSERT INTO price_history (date, time_slot, category, product, price, price_formatted) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                _db_rows(normalize_history(history))
+            )
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_json_migrated', '1')")
+            _touch_all_dates(conn, _bump_version(conn))
+
+    def version(self):
+        """히스토리 버전 (쓰기마다 증가)"""
+        conn = self._connect()
+        try:
+            return _read_version(conn)
+        finally:
+            conn.close()
+
+    # ------------------------------------------
+    # 쓰기
+    # ------------------------------------------
+    def save_snapshot(self, date_key, time_slot, prices):
+        """한 날짜/시간대의 스냅샷을 통째로 교체"""
+        time_slot = time_slot or DAILY_SLOT
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "DELETE FROM price_history WHERE date = ? AND time_slot = ?",
+                    (date_key, time_slot)
+                )
+                _drop_columns(conn, date_key, time_slot)
+                conn.executemany(
+                    "INSERT INTO price_history (date, time_slot, category, product, price, price_formatted) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    _iter_snapshot_rows(date_key, time_slot, prices)
+                )
+                new_version = _bump_version(conn)
+                _touch_dates(conn, [date_key], new_version)
+        finally:
+            conn.close()
+
+        self._update_index(new_version, lambda index: index.replace_snapshot(date_key, time_slot, prices))
+
+    def save_categories(self, date_key, time_slot, prices):
+        """입력된 카테고리만 교체 (나머지 카테고리는 유지)"""
+        time_slot = time_slot or DAILY_SLOT
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "DELETE FROM price_history WHERE date = ? AND time_slot = ? AND category = ?",
+                    [(date_key, time_slot, category) for category in prices]
+                )
+                _drop_columns(conn, date_key, time_slot)
+                conn.executemany(
+                    "INSERT INTO price_history (date, time_slot, category, product, price, price_formatted) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    _iter_snapshot_rows(date_key, time_slot, prices)
+                )
+                _touch_dates(conn, [date_key], _bump_version(conn))
+        finally:
+            conn.close()
+
+        # 카테고리 일부 교체는 스냅샷 전체를 다시 봐야 하므로 다음 조회 때 재구성
+        self._invalidate_index()
+
+    def save_snapshots(self, snapshots):
+        """
+        여러 (날짜, 시간대, 가격) 스냅샷을 한 트랜잭션으로 교체 (일괄 가져오기용) -> 저장한 스냅샷 수
+
+        스냅샷마다 save_snapshot 을 부르면 쓰기마다 버전이 올라가고 인덱스를 갱신하므로,
+        여기서는 버전을 한 번만 올리고 인덱스는 다음 조회 때 한 번에 다시 만듭니다.
+        """
+        count = 0
+        conn = self._connect()
+        try:
+            with conn:
+                new_version = _bump_version(conn)
+                for date_key, time_slot, prices in snapshots:
+                    time_slot = time_slot or DAILY_SLOT
+                    conn.execute(
+                        "DELETE FROM price_history WHERE date = ? AND time_slot = ?",
+                        (date_key, time_slot)
+                    )
+                    _drop_columns(conn, date_key, time_slot)
+                    conn.executemany(
+                        "INSERT INTO price_history (date, time_slot, category, product, price, price_formatted) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        _iter_snapshot_rows(date_key, time_slot, prices)
+                    )
+                    _touch_dates(conn, [date_key], new_version)
+                    count += 1
+        finally:
+            conn.close()
+
+        self._invalidate_index()
+        return count
+
+    def delete_date(self, date_key):
+        """특정 날짜의 모든 시간대 데이터 삭제"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM price_history WHERE date = ?", (date_key,))
+                _drop_columns(conn, date_key)
+                new_version = _bump_version(conn)
+                _touch_dates(conn, [date_key], new_version)
+        finally:
+            conn.close()
+
+        self._update_index(new_version, lambda index: index.remove_date(date_key))
+
+    def replace_history(self, history):
+        """히스토리 전체 교체 (history: 구/신 형식 중첩 dict)"""
+        conn = self._connect()
+        try:
+            with conn:
+                new_version = _bump_version(conn)
+                # 지워지는 날짜와 새로 들어오는 날짜 모두 변경으로 기록
+                _touch_all_dates(conn, new_version)
+                conn.execute("DELETE FROM price_history")
+                conn.execute("DELETE FROM snapshot_columns")
+                conn.executemany(
+                    "INSERT INTO price_history (date, time_slot, category, product, price, price_formatted) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    _db_rows(normalize_history(history))
+                )
+                _touch_all_dates(conn, new_version)
+        finally:
+            conn.close()
+
+        self._invalidate_index()
+
+    def merge_dates(self, records, replace_all=False):
+        """
+        (날짜, {시간대: {카테고리: [항목]}}) 를 날짜 단위로 교체 (백업 복원용, 한 트랜잭션)
+
+        records 는 이터레이터로 받아 한 날짜씩 반영하므로 전체를 메모리에 올리지 않습니다.
+        시간대 dict 대신 None 이면 그 날짜를 삭제하고, replace_all=True 면 records 에 없던 날짜도 삭제합니다.
+        -> (교체한 날짜 수, 삭제한 날짜 수)
+        """
+        replaced = deleted = 0
+        seen = set()
+        conn = self._connect()
+        try:
+            with conn:
+                new_version = _bump_version(conn)
+                for date_key, slots in records:
+                    seen.add(date_key)
+                    conn.execute("DELETE FROM price_history WHERE date = ?", (date_key,))
+                    _drop_columns(conn, date_key)
+                    if slots is None:
+                        deleted += 1
+                    else:
+                        for time_slot, prices in slots.items():
+                            conn.executemany(
+                                "INSERT INTO price_history (date, time_slot, category, product, price, price_formatted) "
+                                "VALUES (?, ?, ?, ?, ?, ?)",
+                                _iter_snapshot_rows(date_key, time_slot, prices)
+                            )
+                        replaced += 1
+                    _touch_dates(conn, [date_key], new_version)
+                if replace_all:
+                    stale = [d for (d,) in conn.execute("SELECT DISTINCT date FROM price_history") if d not in seen]
+                    for date_key in stale:
+                        conn.execute("DELETE FROM price_history WHERE date = ?", (date_key,))
+                        _drop_columns(conn, date_key)
+                    _touch_dates(conn, stale, new_version)
+                    deleted += len(stale)
+        finally:
+            conn.close()
+
+        self._invalidate_index()
+        return replaced, deleted
+
+    def clear(self):
+        """히스토리 전체 삭제"""
+        self.replace_history({})
+
+    # ------------------------------------------
+    # 읽기
+    # ------------------------------------------
+    def iter_rows(self):
+        """모든 행을 날짜/시간대 순 HistoryRow 로 하나씩 생성"""
+        conn = self._connect()
+        try:
+            for row in conn.execute(
+                "SELECT date, time_slot, category, product, price "
+                "FROM price_history ORDER BY date, time_slot, rowid"
+            ):
+                yield HistoryRow._make(row)
+        finally:
+            conn.close()
+
+    def load_history(self):
+        """날짜 -> 시간대 -> 카테고리 -> [항목] 중첩 dict (price_history.json 신 형식과 같은 모양)"""
+        history = {}
+        for row in self.iter_rows():
+            history.setdefault(row.date, {}).setdefault(row.slot, {}).setdefault(row.category, []).append({
+                'product': row.product,
+                'price': row.price,
+                'price_formatted': format_price(row.price)
+            })
+        return history
+
+    def iter_dates(self, since_version=None, month=None):
+        """
+        날짜 순으로 (날짜, {시간대: {카테고리: [항목]}}) 를 하나씩 생성 (백업용)
+
+        since_version 을 주면 그 버전 이후 바뀐 날짜만 (삭제된 날짜는 시간대 dict 대신 None),
+        month('2026-01') 를 주면 그 달만 내보냅니다. 한 번에 한 날짜의 행만 메모리에 올립니다.
+        """
+        conn = self._connect()
+        try:
+            if since_version is not None:
+                dates = [d for (d,) in conn.execute(
+                    "SELECT date FROM date_changes WHERE version > ? ORDER BY date", (since_version,))]
+            else:
+                dates = [d for (d,) in conn.execute("SELECT DISTINCT date FROM price_history ORDER BY date")]
+            if month:
+                dates = [d for d in dates if d.startswith(month)]
+
+            for date_key in dates:
+                slots = {}
+                for time_slot, category, product, price in conn.execute(
+                    "SELECT time_slot, category, product, price FROM price_history "
+                    "WHERE date = ? ORDER BY time_slot, rowid", (date_key,)
+                ):
+                    slots.setdefault(time_slot, {}).setdefault(category, []).append(
+                        {'product': product, 'price': price})
+                yield date_key, (slots or None)
+        finally:
+            conn.close()
+
+    def months(self):
+        """데이터가 있는 달 목록 ('2026-01', 최신 순)"""
+        conn = self._connect()
+        try:
+            return [m for (m,) in conn.execute(
+                "SELECT DISTINCT substr(date, 1, 7) FROM price_history ORDER BY 1 DESC")]
+        finally:
+            conn.close()
+
+    def last_backup_version(self):
+        """마지막 전체/증분 백업 시점의 버전 (백업한 적 없으면 None)"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'last_backup_version'").fetchone()
+            return int(row[0]) if row else None
+        finally:
+            conn.close()
+
+    def mark_backup(self, version):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_backup_version', ?)",
+                             (str(version),))
+        finally:
+            conn.close()
+
+    def changed_date_count(self, since_version):
+        """since_version 이후 바뀐 날짜 수"""
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM date_changes WHERE version > ?",
+                                (since_version,)).fetchone()[0]
+        finally:
+            conn.close()
+
+    # ------------------------------------------
+    # 열 단위 히스토리 (메모리)
+    # ------------------------------------------
+    def history_table(self):
+        """현재 히스토리 버전의 PriceHistoryTable (버전이 바뀐 경우에만 재구성, 프로세스에서 공유)"""
+        current_version = self.version()
+        with self._index_lock:
+            if self._index is not None and self._index_version == current_version:
+                return self._index
+
+        run_metrics.mark()
+        conn = self._connect()
+        try:
+            with conn:
+                # 빠진 스냅샷 배열을 채우고 읽는 동안 다른 쓰기는 대기 (읽은 버전과 내용이 어긋나지 않게)
+                conn.execute("BEGIN IMMEDIATE")
+                version = _read_version(conn)
+                columns_version = conn.execute("SELECT value FROM meta WHERE key = 'columns_version'").fetchone()
+                if columns_version is None or int(columns_version[0]) != version:
+                    _fill_snapshot_columns(conn)
+                    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('columns_version', ?)",
+                                 (str(version),))
+                index = PriceHistoryTable.from_columns(
+                    [name for (name,) in conn.execute("SELECT name FROM categories ORDER BY id")],
+                    [name for (name,) in conn.execute("SELECT name FROM products ORDER BY id")],
+                    conn.execute(
+                        "SELECT date, time_slot, category_ids, product_ids, prices, price_width "
+                        "FROM snapshot_columns ORDER BY date, time_slot"
+                    )
+                )
+        finally:
+            conn.close()
+
+        with self._index_lock:
+            self._index = index
+            self._index_version = version
+        return index
+
+    def _update_index(self, new_version, apply):
+        """
+        이 프로세스의 쓰기를 인덱스에 바로 반영 (직전 버전일 때만)
+
+        다른 세션이 읽고 있는 인덱스는 건드리지 않고, apply 가 만든 새 인덱스를 잠금 안에서 바꿔 끼웁니다.
+        만드는 동안 다른 쓰기가 먼저 반영됐거나 덧붙인 스냅샷이 INDEX_OVERLAY_LIMIT 를 넘으면
+        새 인덱스는 버리고 다음 조회 때 다시 만듭니다.
+        """
+        with self._index_lock:
+            base, base_version = self._index, self._index_version
+        patched = apply(base) if base is not None and base_version == new_version - 1 else None
+        if patched is not None and patched.pending_changes() > INDEX_OVERLAY_LIMIT:
+            patched = None
+
+        with self._index_lock:
+            if patched is not None and self._index is base:
+                self._index = patched
+                self._index_version = new_version
+            elif self._index_version is None or self._index_version < new_version:
+                self._index = None
+                self._index_version = None
+
+    def _invalidate_index(self):
+        with self._index_lock:
+            self._index = None
+            self._index_version = None
+
+
+def _read_version(conn):
+    row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    return int(row[0]) if row else 0
+
+
+def _bump_version(conn):
+    """같은 트랜잭션 안에서 버전 증가"""
+    new_version = _read_version(conn) + 1
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (str(new_version),))
+    return new_version
+
+
+def _drop_columns(conn, date_key, time_slot=None):
+    """바뀐 스냅샷의 id/가격 배열 삭제 (다음 history_table() 에서 다시 채움)"""
+    if time_slot is None:
+        conn.execute("DELETE FROM snapshot_columns WHERE date = ?", (date_key,))
+    else:
+        conn.execute("DELETE FROM snapshot_columns WHERE date = ? AND time_slot = ?", (date_key, time_slot))
+
+
+def _fill_snapshot_columns(conn):
+    """행은 있는데 배열이 없는 스냅샷만 행에서 배열을 만들어 저장 (새 이름은 사전에 추가)"""
+    existing = set(conn.execute("SELECT date, time_slot FROM snapshot_columns"))
+    missing = [key for key in conn.execute("SELECT DISTINCT date, time_slot FROM price_history").fetchall()
+               if key not in existing]
+    if not missing:
+        return
+
+    categories = NameDictionary(name for (name,) in conn.execute("SELECT name FROM categories ORDER BY id"))
+    products = NameDictionary(name for (name,) in conn.execute("SELECT name FROM products ORDER BY id"))
+    known_categories, known_products = len(categories.names), len(products.names)
+    for date_key, time_slot in missing:
+        rows = conn.execute(
+            "SELECT category, product, price FROM price_history WHERE date = ? AND time_slot = ? ORDER BY rowid",
+            (date_key, time_slot)
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO snapshot_columns "
+            "(date, time_slot, category_ids, product_ids, prices, price_width) VALUES (?, ?, ?, ?, ?, ?)",
+            (date_key, time_slot) + encode_snapshot(rows, categories, products)
+        )
+    conn.executemany("INSERT INTO categories (id, name) VALUES (?, ?)",
+                     list(enumerate(categories.names))[known_categories:])
+    conn.executemany("INSERT INTO products (id, name) VALUES (?, ?)",
+                     list(enumerate(products.names))[known_products:])
+
+
+def _touch_dates(conn, dates, version):
+    conn.executemany("INSERT OR REPLACE INTO date_changes (date, version) VALUES (?, ?)",
+                     [(date_key, version) for date_key in dates])
+
+
+def _touch_all_dates(conn, version):
+    conn.execute("INSERT OR REPLACE INTO date_changes (date, version) "
+                 "SELECT DISTINCT date, ? FROM price_history", (version,))
+
+
+def slot_for_hour(hour):
+    """시각(시) -> 가장 가까운 입력 시간대 (12시 전 10:00, 16시 전 13:00, 그 뒤 18:00)"""
+    if hour < 12:
+        return TIME_SLOTS[0]
+    if hour < 16:
+        return TIME_SLOTS[1]
+    return TIME_SLOTS[2]
+
+
+def _iter_snapshot_rows(date_key, time_slot, prices):
+    """스냅샷 1개 {카테고리: [항목]} -> DB 행 (시간대가 없으면 DAILY_SLOT)"""
+    time_slot = time_slot or DAILY_SLOT
+    for category, items in prices.items():
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict) or 'product' not in item or 'price' not in item:
+                continue
+            yield (date_key, time_slot, category, item['product'], int(item['price']), None)
+
+
+def normalize_history(history):
+    """
+    구/신 형식이 섞인 중첩 dict -> HistoryRow (외부 입력 경계에서 한 번만 형식 구분)
+
+    신 형식: 날짜 -> 시간대 -> 카테고리 -> [항목] / 구 형식: 날짜 -> 카테고리 -> [항목] (DAILY_SLOT 으로)
+    """
+    for date_key, date_data in history.items():
+        if not isinstance(date_data, dict):
+            continue
+        for key, value in date_data.items():
+            if isinstance(value, dict):
+                rows = _iter_snapshot_rows(date_key, key, value)
+            elif isinstance(value, list):
+                rows = _iter_snapshot_rows(date_key, DAILY_SLOT, {key: value})
+            else:
+                continue
+            for row in rows:
+                yield HistoryRow._make(row[:5])
+
+
+def _db_rows(rows):
+    """HistoryRow -> INSERT 용 튜플 (price_formatted 는 저장하지 않음)"""
+    for row in rows:
+        yield (row.date, row.slot, row.category, row.product, row.price, None)
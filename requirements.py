@@ -3,6 +3,8 @@ import yfinance as yf
 import plotly.graph_objects as go
 import pandas as pd
 
+from market_snapshot import close_prices, compute_snapshot
+
 # 1. 페이지 설정
 st.set_page_config(page_title="글로벌 마켓 워치", layout="wide", page_icon="⚡")
 
@@ -54,41 +56,34 @@ def get_batch_data(tickers, period, interval):
     except Exception as e:
         return None
 
+@st.cache_data(max_entries=8)
+def get_batch_snapshot(frame):
+    """(종가 표, 티커별 요약 표) - 차트와 같은 배치 데이터(raw_data)에서, 데이터마다 한 번만 계산"""
+    closes = close_prices(frame)
+    return closes, compute_snapshot(closes)
+
 # 데이터 로딩
 raw_data = get_batch_data(all_tickers, p, i)
+close_data, snapshot = get_batch_snapshot(raw_data)
 
 # 6. 개별 데이터 추출 및 차트 그리기
-def process_and_draw(ticker, name, full_data):
+def process_and_draw(ticker, name, closes, snapshot):
     try:
-        # 데이터프레임에서 해당 티커만 꺼내기
-        if full_data is None or full_data.empty:
-            return None
-
-        # MultiIndex 처리 (yfinance 버전에 따라 구조가 다를 수 있음)
-        try:
-            df = full_data[ticker]
-        except KeyError:
+        # 요약 표에서 해당 티커 행만 읽기 (계산은 get_batch_snapshot 에서 한 번에)
+        if closes is None or ticker not in snapshot.index:
             return None # 티커 이름이 안 맞으면 패스
 
-        # 종가(Close)만 가져오기
-        if 'Close' in df.columns:
-            series = df['Close']
-        else:
-            series = df.iloc[:, 0] # 첫번째 컬럼 강제 사용
-
-        # 결측치 제거
-        series = series.dropna()
-        if len(series) < 2:
+        row = snapshot.loc[ticker]
+        if pd.isna(row['prev']):
             return None
 
-        # 값 계산
-        latest = float(series.iloc[-1]) # float로 강제 변환 (중요!)
-        prev = float(series.iloc[-2])
-        delta = latest - prev
-        delta_pct = (delta / prev) * 100
+        latest = float(row['current'])
+        delta = float(row['delta'])
+        delta_pct = float(row['delta_pct'])
+        series = closes[ticker].dropna()
         
         # 차트 그리기
-        y_min, y_max = series.min(), series.max()
+        y_min, y_max = float(row['min']), float(row['max'])
         padding = (y_max - y_min) * 0.1 if y_max != y_min else 1.0
         
         color = '#00e676' if delta >= 0 else '#ff5252'
@@ -125,7 +120,7 @@ else:
         cols = st.columns(4)
         for idx, (name, ticker) in enumerate(row):
             with cols[idx]:
-                result = process_and_draw(ticker, name, raw_data)
+                result = process_and_draw(ticker, name, close_data, snapshot)
                 
                 if result and 'error' not in result:
                     delta_sign = "▲" if result['delta'] > 0 else "▼"
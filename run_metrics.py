@@ -0,0 +1,219 @@
+"""
+스크립트 실행(rerun)별 단계 시간 + 캐시 적중/미스 기록
+
+페이지가 느릴 때 야후 다운로드, 국채 금리 조회, 히스토리 로딩, 차트 직렬화 중 어디서 시간이 걸렸는지
+알 수 있도록 실행 한 번마다 단계별 시간과 캐시 결과를 모아서 JSON 한 줄로 남깁니다.
+
+    run_metrics.begin_run("page")            # 스크립트 맨 위
+    with run_metrics.stage("cards.render"):  # 단계 시간 (같은 이름은 합산)
+        ...
+    run_metrics.end_run()                    # 스크립트 맨 끝 -> runs.jsonl 에 한 줄 추가
+
+    @run_metrics.cached("load_price_history")  # 캐시 함수 바깥에 씌움 (호출 시간도 단계로 기록)
+    @st.cache_data(ttl=60)
+    def load_price_history():
+        run_metrics.mark()                       # 본문이 실행됐다 = 미스
+        ...
+
+- mark() 는 가장 안쪽에서 실행 중인 cached 호출의 결과를 정함 ("miss", 만료된 값을 준 경우 "stale")
+  표시가 없으면 적중(hit)으로 기록
+- 기록은 스레드별로 따로 모음 (Streamlit 세션마다 스크립트 스레드가 다름)
+- 프래그먼트만 다시 실행될 때는 run() 데코레이터가 그 프래그먼트를 실행 한 번으로 기록
+- 스크립트가 프래그먼트 안에서 중간에 멈추면(st.rerun, 예외 등) 끝나지 않은 페이지 기록은 버림
+  (스레드에 남아 있으면 다음 프래그먼트 실행의 시간이 거기에 섞임)
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from source_replay import source_replay
+
+RUN_METRICS_LOG = os.path.join(source_replay.cache_dir("metrics"), "runs.jsonl")
+MAX_LOG_BYTES = 5 * 1024 * 1024   # 넘으면 runs.jsonl.1 로 옮기고 새로 시작
+RECENT_RUNS = 100                 # 진단 패널에서 요약할 최근 실행 수
+CACHE_OUTCOMES = ("hit", "stale", "miss")
+
+
+class RunMetrics:
+    """실행별 단계 시간/캐시 결과 수집기 (스레드 안전)"""
+
+    def __init__(self, log_path=RUN_METRICS_LOG, recent_runs=RECENT_RUNS, max_log_bytes=MAX_LOG_BYTES):
+        self.log_path = log_path
+        self.max_log_bytes = max_log_bytes
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._recent = deque(maxlen=recent_runs)
+        self._cache_totals = {}  # 이름 -> {outcome: 횟수} (프로세스 시작 이후)
+
+    # ------------------------------------------
+    # 실행 단위
+    # ------------------------------------------
+    def _run(self):
+        return getattr(self._local, 'run', None)
+
+    def begin_run(self, label):
+        """새 실행 기록 시작 (끝나지 않은 이전 기록은 버림)"""
+        self._local.run = {
+            'label': label,
+            'started_at': datetime.now().isoformat(timespec='milliseconds'),
+            '_start': time.perf_counter(),
+            'stages': {},
+            'caches': {},
+        }
+        self._local.calls = []
+
+    def end_run(self):
+        """실행 기록을 끝내고 JSON 한 줄로 남김 -> 기록(dict), 진행 중인 기록이 없으면 None"""
+        run = self._run()
+        if run is None:
+            return None
+        self._local.run = None
+        run['total_ms'] = round((time.perf_counter() - run.pop('_start')) * 1000, 2)
+        for entry in run['stages'].values():
+            entry['ms'] = round(entry['ms'], 2)
+        with self._lock:
+            self._recent.append(run)
+        self._write(run)
+        return run
+
+    def discard_run(self):
+        """진행 중인 실행 기록을 남기지 않고 버림"""
+        self._local.run = None
+        self._local.calls = []
+
+    def run(self, label):
+        """
+        프래그먼트용 데코레이터
+
+        페이지 전체 실행 중이면 단계 하나로, 프래그먼트만 다시 실행될 때는 별도의 실행으로 기록합니다.
+        페이지 실행 중에 프래그먼트가 끝까지 가지 못하면(StopException/RerunException 등) 페이지 기록을 버립니다.
+        """
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if self._run() is not None:
+                    completed = False
+                    try:
+                        with self.stage(label):
+                            result = fn(*args, **kwargs)
+                        completed = True
+                        return result
+                    finally:
+                        if not completed:
+                            self.discard_run()
+                self.begin_run(label)
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.end_run()
+            return wrapper
+        return decorator
+
+    # ------------------------------------------
+    # 단계 / 캐시
+    # ------------------------------------------
+    @contextmanager
+    def stage(self, name):
+        """단계 시간 측정 (실행 기록이 없으면 측정만 하고 버림)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            run = self._run()
+            if run is not None:
+                entry = run['stages'].setdefault(name, {'ms': 0.0, 'count': 0})
+                entry['ms'] += (time.perf_counter() - start) * 1000
+                entry['count'] += 1
+
+    def cached(self, name):
+        """캐시 함수 호출을 감싸서 hit/stale/miss 와 호출 시간 기록 (.clear 등 원래 속성은 그대로 사용 가능)"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                calls = getattr(self._local, 'calls', None)
+                if calls is None:
+                    calls = self._local.calls = []
+                call = {'outcome': 'hit'}
+                calls.append(call)
+                try:
+                    with self.stage(name):
+                        return fn(*args, **kwargs)
+                finally:
+                    calls.pop()
+                    self._count(name, call['outcome'])
+            if hasattr(fn, 'clear'):
+                wrapper.clear = fn.clear
+            return wrapper
+        return decorator
+
+    def mark(self, outcome="miss"):
+        """가장 안쪽에서 실행 중인 cached 호출의 결과 지정 (cached 호출 밖이면 무시)"""
+        calls = getattr(self._local, 'calls', None)
+        if calls:
+            calls[-1]['outcome'] = outcome
+
+    def _count(self, name, outcome):
+        run = self._run()
+        if run is not None:
+            counts = run['caches'].setdefault(name, {})
+            counts[outcome] = counts.get(outcome, 0) + 1
+        with self._lock:
+            totals = self._cache_totals.setdefault(name, dict.fromkeys(CACHE_OUTCOMES, 0))
+            totals[outcome] = totals.get(outcome, 0) + 1
+
+    # ------------------------------------------
+    # 기록 파일
+    # ------------------------------------------
+    def _write(self, run):
+        line = json.dumps(run, ensure_ascii=False)
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > self.max_log_bytes:
+                    os.replace(self.log_path, self.log_path + ".1")
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(line + "\n")
+            except OSError as e:
+                print(f"Error writing run metrics: {e}")
+
+    # ------------------------------------------
+    # 진단 패널용 요약
+    # ------------------------------------------
+    def recent_runs(self):
+        with self._lock:
+            return list(self._recent)
+
+    def stage_summary(self):
+        """최근 실행들의 단계별 [{'stage', 'runs', 'avg_ms', 'max_ms', 'last_ms'}] (평균이 큰 순)"""
+        samples = {}
+        for run in self.recent_runs():
+            samples.setdefault(f"[{run['label']}] 전체", []).append(run['total_ms'])
+            for name, entry in run['stages'].items():
+                samples.setdefault(name, []).append(entry['ms'])
+        rows = [{
+            'stage': name,
+            'runs': len(values),
+            'avg_ms': sum(values) / len(values),
+            'max_ms': max(values),
+            'last_ms': values[-1],
+        } for name, values in samples.items()]
+        return sorted(rows, key=lambda row: row['avg_ms'], reverse=True)
+
+    def cache_summary(self):
+        """캐시 함수별 [{'name', 'hit', 'stale', 'miss', 'hit_rate'}] (프로세스 시작 이후 누적)"""
+        with self._lock:
+            totals = {name: dict(counts) for name, counts in self._cache_totals.items()}
+        rows = []
+        for name, counts in sorted(totals.items()):
+            calls = sum(counts.values())
+            served = counts.get('hit', 0) + counts.get('stale', 0)
+            rows.append(dict(counts, name=name, hit_rate=served / calls * 100 if calls else None))
+        return rows
+
+
+run_metrics = RunMetrics()
@@ -0,0 +1,117 @@
+"""
+외부 데이터 소스 상태 기록 + 서킷 브레이커
+
+소스별 성공률, 응답 시간, 마지막 오류를 기록합니다.
+연속으로 failure_threshold 번 실패한 소스는 cool-down 동안 호출하지 않고 건너뛰며,
+cool-down 이 끝나면 한 번 시험 호출(half-open)을 허용합니다. 다시 실패하면 cool-down 이 두 배로 늘어납니다.
+"""
+import threading
+import time
+
+FAILURE_THRESHOLD = 3
+COOLDOWN_SECONDS = 300
+MAX_COOLDOWN_SECONDS = 3600
+TRIAL_TIMEOUT_SECONDS = 60  # 시험 호출이 끝나지 않을 때 다음 시험을 허용하기까지
+
+
+class SourceHealthRegistry:
+    """소스 이름별 상태 기록 (스레드 안전)"""
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, cooldown_seconds=COOLDOWN_SECONDS,
+                 max_cooldown_seconds=MAX_COOLDOWN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self._lock = threading.Lock()
+        self._sources = {}
+
+    def _entry(self, name):
+        entry = self._sources.get(name)
+        if entry is None:
+            entry = self._sources[name] = {
+                'calls': 0,
+                'successes': 0,
+                'failures': 0,
+                'consecutive_failures': 0,
+                'total_latency': 0.0,
+                'last_latency': None,
+                'last_error': None,
+                'last_success_at': None,
+                'last_failure_at': None,
+                'open_until': 0.0,
+                'cooldown': self.cooldown_seconds,
+                'trial_started_at': None,
+            }
+        return entry
+
+    def allow(self, name):
+        """지금 호출해도 되는지 (차단 중이면 False, cool-down 이 끝났으면 시험 호출 1회 허용)"""
+        with self._lock:
+            entry = self._entry(name)
+            if entry['open_until'] == 0.0:
+                return True
+            now = time.time()
+            if now < entry['open_until']:
+                return False
+            trial_started_at = entry['trial_started_at']
+            if trial_started_at is not None and now - trial_started_at < TRIAL_TIMEOUT_SECONDS:
+                return False
+            entry['trial_started_at'] = now
+            return True
+
+    def release_trial(self, name):
+        """시작 전에 취소된 호출 -> 시험 호출 자리만 돌려줌 (성공/실패 횟수와 cool-down 은 그대로)"""
+        with self._lock:
+            self._entry(name)['trial_started_at'] = None
+
+    def record_success(self, name, latency):
+        with self._lock:
+            entry = self._entry(name)
+            entry['calls'] += 1
+            entry['successes'] += 1
+            entry['consecutive_failures'] = 0
+            entry['total_latency'] += latency
+            entry['last_latency'] = latency
+            entry['last_success_at'] = time.time()
+            entry['open_until'] = 0.0
+            entry['cooldown'] = self.cooldown_seconds
+            entry['trial_started_at'] = None
+
+    def record_failure(self, name, latency, error):
+        with self._lock:
+            entry = self._entry(name)
+            entry['calls'] += 1
+            entry['failures'] += 1
+            entry['consecutive_failures'] += 1
+            entry['total_latency'] += latency
+            entry['last_latency'] = latency
+            entry['last_error'] = error
+            entry['last_failure_at'] = time.time()
+
+            if entry['trial_started_at'] is not None:
+                # 시험 호출 실패 -> cool-down 두 배
+                entry['cooldown'] = min(entry['cooldown'] * 2, self.max_cooldown_seconds)
+                entry['open_until'] = time.time() + entry['cooldown']
+            elif entry['consecutive_failures'] >= self.failure_threshold:
+                entry['open_until'] = time.time() + entry['cooldown']
+            entry['trial_started_at'] = None
+
+    def snapshot(self):
+        """관리자 화면용 상태 목록"""
+        now = time.time()
+        rows = []
+        with self._lock:
+            for name, entry in self._sources.items():
+                calls = entry['calls']
+                rows.append({
+                    'source': name,
+                    'calls': calls,
+                    'success_rate': (entry['successes'] / calls * 100) if calls else None,
+                    'avg_latency': (entry['total_latency'] / calls) if calls else None,
+                    'last_latency': entry['last_latency'],
+                    'consecutive_failures': entry['consecutive_failures'],
+                    'blocked_for': max(0.0, entry['open_until'] - now),
+                    'last_error': entry['last_error'],
+                    'last_success_at': entry['last_success_at'],
+                })
+        return rows
@@ -0,0 +1,186 @@
+"""
+외부 데이터 소스 녹화/재생 (Yahoo, FDR, 한국은행, 네이버, ETF 대체)
+
+실제 응답을 fixtures 디렉터리에 저장해 두고(record), 나중에 네트워크 없이 그대로 돌려줍니다(replay).
+재생할 때는 소스별 지연과 실패를 일부러 넣어 느린 소스/장애 상황을 재현할 수 있습니다.
+
+환경 변수로 설정합니다 (앱, 벤치마크 모두 같은 방식).
+
+    DASHBOARD_SOURCE_MODE=record streamlit run app.py     # 실제 응답 저장
+    DASHBOARD_SOURCE_MODE=replay streamlit run app.py     # 저장된 응답으로 실행
+
+    DASHBOARD_FIXTURES_DIR=fixtures/sources               # 저장 위치 (기본값)
+    DASHBOARD_REPLAY_LATENCY="yahoo=2.5,naver=0.8,*=0.1"   # 소스별 지연 (초, '*' 는 나머지 전체)
+    DASHBOARD_REPLAY_FAILURE="fdr=1,bok=0.3"               # 소스별 실패 확률 (0~1)
+
+- 소스 이름: yahoo (OhlcStore 다운로드), fdr, bok, naver, etf
+- 키에는 조회 날짜를 넣지 않으므로 녹화한 날과 다른 날에도 같은 fixture 를 씁니다
+- 재생한 DataFrame 은 날짜 인덱스를 녹화 시점과 오늘의 차이(일 단위)만큼 옮겨서
+  '최근 5일/1개월' 같은 기간 자르기가 녹화 당시와 같은 결과를 내게 합니다
+- 재생 모드에서 fixture 가 없으면 FixtureMissing 예외 (실제 소스 실패와 같은 경로로 처리됨)
+- record/replay 모드에서는 OHLC 저장소, 응답 캐시, 실행 기록을 fixtures 디렉터리 아래
+  .cache/<모드> 에 따로 두고(cache_dir), 디스크에 남긴 값으로 소스 호출을 건너뛰는 단계
+  (국채 금리/시장 스냅샷 디스크 캐시, OHLC 증분 갱신)는 쓰지 않습니다 (persistent 가 False).
+  재생한 날짜 이동 데이터가 실제 저장소에 섞이거나, 저장된 값 때문에 지연/실패 주입이 가려지지 않게 합니다.
+"""
+import hashlib
+import os
+import pickle
+import random
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+SOURCE_MODES = ("live", "record", "replay")
+FIXTURES_DIR = os.path.join("fixtures", "sources")
+LIVE_CACHE_DIR = ".cache"
+
+
+class FixtureMissing(Exception):
+    """재생 모드에서 녹화된 응답이 없음"""
+
+
+class InjectedFailure(Exception):
+    """재생 모드에서 일부러 넣은 실패"""
+
+
+def parse_source_values(text):
+    """'yahoo=2.5,*=0.1' -> {'yahoo': 2.5, '*': 0.1} (잘못된 항목은 무시)"""
+    values = {}
+    for part in (text or "").split(","):
+        name, _, value = part.partition("=")
+        try:
+            values[name.strip()] = float(value)
+        except ValueError:
+            continue
+    return values
+
+
+def _shift_frame(value, recorded_at):
+    """DatetimeIndex 를 가진 DataFrame/Series 를 녹화 이후 지난 일수만큼 뒤로 옮김"""
+    index = getattr(value, 'index', None)
+    if index is None or not hasattr(index, 'tz_localize'):
+        return value
+    days = (datetime.now().date() - datetime.fromtimestamp(recorded_at).date()).days
+    if days <= 0:
+        return value
+    import pandas as pd
+    value = value.copy()
+    value.index = value.index + pd.Timedelta(days=days)
+    return value
+
+
+class SourceReplay:
+    """소스 호출을 감싸서 live / record / replay 로 동작 (스레드 안전)"""
+
+    def __init__(self, mode="live", fixtures_dir=FIXTURES_DIR, latency=None, failure=None, seed=None):
+        if mode not in SOURCE_MODES:
+            raise ValueError(f"알 수 없는 모드: {mode} ({', '.join(SOURCE_MODES)})")
+        self.mode = mode
+        self.fixtures_dir = fixtures_dir
+        self.latency = dict(latency or {})
+        self.failure = dict(failure or {})
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """환경 변수로 생성 (모드 값이 잘못됐으면 경고만 남기고 live, 가져오는 중에 앱이 죽지 않게)"""
+        environ = os.environ if environ is None else environ
+        mode = environ.get("DASHBOARD_SOURCE_MODE", "live").strip().lower() or "live"
+        if mode not in SOURCE_MODES:
+            print(f"⚠️ 알 수 없는 DASHBOARD_SOURCE_MODE={mode!r}, live 로 실행합니다 ({', '.join(SOURCE_MODES)})")
+            mode = "live"
+        return cls(
+            mode=mode,
+            fixtures_dir=environ.get("DASHBOARD_FIXTURES_DIR", FIXTURES_DIR),
+            latency=parse_source_values(environ.get("DASHBOARD_REPLAY_LATENCY")),
+            failure=parse_source_values(environ.get("DASHBOARD_REPLAY_FAILURE")),
+        )
+
+    @property
+    def persistent(self):
+        """디스크에 남긴 값을 다음 실행에서 다시 써도 되는지 (live 모드만)"""
+        return self.mode == "live"
+
+    def cache_dir(self, name):
+        """로컬 저장 디렉터리 (live: .cache/<name>, 그 외: <fixtures>/.cache/<모드>/<name>)"""
+        if self.mode == "live":
+            return os.path.join(LIVE_CACHE_DIR, name)
+        return os.path.join(self.fixtures_dir, LIVE_CACHE_DIR, self.mode, name)
+
+    def _setting(self, values, source):
+        return values.get(source, values.get("*", 0.0))
+
+    # ------------------------------------------
+    # fixture 파일
+    # ------------------------------------------
+    def _path(self, source, key):
+        safe = re.sub(r'[^0-9A-Za-z_]', '_', source)
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.fixtures_dir, safe, f"{digest}.pkl")
+
+    def _save(self, source, key, value):
+        path = self._path(source, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({'source': source, 'key': key, 'recorded_at': time.time(), 'value': value},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error recording fixture {source} {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _load(self, source, key):
+        path = self._path(source, key)
+        if not os.path.exists(path):
+            raise FixtureMissing(f"{source}: {key}")
+        with open(path, 'rb') as f:
+            stored = pickle.load(f)
+        return _shift_frame(stored['value'], stored['recorded_at'])
+
+    # ------------------------------------------
+    # 호출
+    # ------------------------------------------
+    def call(self, source, key, fetch):
+        """
+        fetch() 결과 반환
+
+        live: 그대로 호출 / record: 호출 후 결과 저장 / replay: 지연·실패를 넣고 저장된 결과 반환
+        """
+        if self.mode == "live":
+            return fetch()
+        if self.mode == "record":
+            value = fetch()
+            if value is not None:
+                self._save(source, key, value)
+            return value
+
+        delay = self._setting(self.latency, source)
+        if delay > 0:
+            time.sleep(delay)
+        with self._lock:
+            failed = self._random.random() < self._setting(self.failure, source)
+        if failed:
+            raise InjectedFailure(f"{source}: {key}")
+        return self._load(source, key)
+
+    def recorded(self):
+        """소스별 fixture 개수"""
+        counts = {}
+        if os.path.isdir(self.fixtures_dir):
+            for source in sorted(os.listdir(self.fixtures_dir)):
+                if source.startswith("."):
+                    continue  # 모드별 로컬 저장 디렉터리
+                folder = os.path.join(self.fixtures_dir, source)
+                if os.path.isdir(folder):
+                    counts[source] = sum(1 for name in os.listdir(folder) if name.endswith(".pkl"))
+        return counts
+
+
+source_replay = SourceReplay.from_env()
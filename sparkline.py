@@ -0,0 +1,81 @@
+"""
+지표 카드용 SVG 스파크라인
+
+카드마다 Plotly Figure 를 만들어 브라우저로 보내던 방식 대신,
+시리즈를 가로 픽셀 수만큼(LTTB) 줄인 뒤 카드 HTML 안에 바로 넣을 수 있는 <svg> 문자열로 만듭니다.
+같은 (티커, 기간, 마지막 봉) 이면 다시 그리지 않고 캐시된 문자열을 돌려줍니다.
+"""
+import threading
+from collections import OrderedDict
+
+from downsample import lttb_indices
+
+SPARKLINE_WIDTH = 120   # viewBox 가로 (= 최대 점 개수)
+SPARKLINE_HEIGHT = 40   # viewBox 세로
+SPARKLINE_CACHE_SIZE = 256
+
+
+def hex_to_rgba(color, alpha):
+    """'#ff5252' -> 'rgba(255, 82, 82, 0.1)'"""
+    r, g, b = (int(color.lstrip('#')[i:i + 2], 16) for i in (0, 2, 4))
+    return f"rgba({r}, {g}, {b}, {alpha})"
+
+
+def render_sparkline(values, color, width=SPARKLINE_WIDTH, height=SPARKLINE_HEIGHT):
+    """값 목록 -> 선 + 아래 채움 <svg> 문자열 (값이 2개 미만이면 빈 문자열)"""
+    n = len(values)
+    if n < 2:
+        return ""
+
+    y_min, y_max = min(values), max(values)
+    padding = (y_max - y_min) * 0.1 if y_max != y_min else 1.0
+    lo, span = y_min - padding, (y_max - y_min) + 2 * padding
+
+    coords = [
+        f"{idx * width / (n - 1):.1f},{height - (values[idx] - lo) * height / span:.1f}"
+        for idx in lttb_indices(values, width)
+    ]
+    line = " ".join(coords)
+    area = f"0,{height} {line} {width},{height}"
+    return (
+        f"<svg class='sparkline' viewBox='0 0 {width} {height}' preserveAspectRatio='none'>"
+        f"<polygon points='{area}' fill='{hex_to_rgba(color, 0.1)}' stroke='none'/>"
+        f"<polyline points='{line}' fill='none' stroke='{color}' stroke-width='2' "
+        f"vector-effect='non-scaling-stroke' stroke-linejoin='round'/>"
+        f"</svg>"
+    )
+
+
+class SparklineCache:
+    """(티커, 기간, 마지막 봉 시각, 마지막 값) -> SVG 문자열 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries=SPARKLINE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, ticker, period, series, color):
+        """
+        pandas Series -> SVG 문자열
+
+        진행 중인 봉은 시각은 그대로인 채 값만 바뀌므로 마지막 값도 키에 포함합니다.
+        """
+        if series is None or len(series) < 2:
+            return ""
+        key = (ticker, period, series.index[-1], float(series.iloc[-1]), len(series), color)
+        with self._lock:
+            svg = self._entries.get(key)
+            if svg is not None:
+                self._entries.move_to_end(key)
+                return svg
+
+        svg = render_sparkline(series.to_numpy(dtype=float).tolist(), color)
+        with self._lock:
+            self._entries[key] = svg
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return svg
+
+
+sparkline_cache = SparklineCache()